@@ -0,0 +1,390 @@
+"""
+Бенчмарки для обох завдань.
+
+Запуск:
+    python benchmark.py                          # усі бенчмарки, результат JSON у stdout
+    python benchmark.py monte_carlo --output b.json
+    python benchmark.py --baseline old.json      # порівняння з попереднім запуском
+    python benchmark.py --profile prof/          # дамп cProfile для кожного бенчмарку
+    python benchmark.py --tracemalloc            # пікова пам'ять кожного бенчмарку
+"""
+
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def _run_seconds(command: List[str]) -> float:
+    """
+    Час виконання команди в окремому процесі (холодний старт інтерпретатора).
+    """
+    start = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def bench_cold_start(repeats: int = 5) -> Dict:
+    """
+    Вимірює час холодного старту: імпорт модулів і CLI з --json.
+
+    Returns:
+        Dict: Медіана та мінімум часу (с) для кожної команди
+    """
+    commands = {
+        "python": [sys.executable, "-c", "pass"],
+        "import_task1": [sys.executable, "-c", "import task1"],
+        "import_task2": [sys.executable, "-c", "import task2"],
+        "task1_json": [sys.executable, "task1.py", "--json"],
+        "task2_json": [sys.executable, "task2.py", "--json", "--seed", "0"],
+    }
+    results = {}
+    for name, command in commands.items():
+        timings = [_run_seconds(command) for _ in range(repeats)]
+        results[name] = {"median_s": statistics.median(timings), "min_s": min(timings)}
+    return results
+
+def _best_time(func: Callable[[], object], repeats: int) -> float:
+    """
+    Найкращий час (с) із repeats запусків func.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def _peak_memory(func: Callable[[], object]) -> int:
+    """
+    Пікове додаткове виділення пам'яті (байти) під час виконання func.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    if not was_tracing:
+        tracemalloc.stop()
+    return peak
+
+def bench_monte_carlo(sizes=(10**3, 10**4, 10**5, 10**6, 10**7), repeats: int = 3) -> Dict:
+    """
+    Пропускна здатність (точок/с) обох методів Монте-Карло для різних n.
+    """
+    import task2
+
+    results = {"integration": {}, "geometric": {}}
+    for n in sizes:
+        seconds = _best_time(lambda: task2.monte_carlo_integration(task2.f, 0, 2, n, history="none", seed=0),
+                             repeats)
+        results["integration"][str(n)] = {"seconds": seconds, "samples_per_s": n / seconds}
+        seconds = _best_time(lambda: task2.monte_carlo_geometric_method(task2.f, 0, 2, n, seed=0), repeats)
+        results["geometric"][str(n)] = {"seconds": seconds, "samples_per_s": n / seconds}
+    return results
+
+def bench_history_memory(sizes=(10**4, 10**5, 10**6), modes=("full", "log", "none")) -> Dict:
+    """
+    Пікова пам'ять monte_carlo_integration для різних режимів історії.
+    """
+    import task2
+
+    results = {}
+    for mode in modes:
+        results[mode] = {
+            str(n): {"peak_bytes": _peak_memory(
+                lambda: task2.monte_carlo_integration(task2.f, 0, 2, n, history=mode, seed=0))}
+            for n in sizes
+        }
+    return results
+
+def bench_task1_latency(repeats: int = 5) -> Dict:
+    """
+    Затримка solve_production_optimization за етапами: побудова моделі,
+    виклик розв'язувача, отримання результатів.
+    """
+    import pulp
+    import task1
+
+    stages = {"build_s": [], "solve_s": [], "extract_s": [], "total_s": []}
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model, variables, _ = task1.build_production_model()
+        built = time.perf_counter()
+        model.solve(pulp.PULP_CBC_CMD(msg=False))
+        solved = time.perf_counter()
+        task1.extract_solution(model, variables)
+        extracted = time.perf_counter()
+
+        stages["build_s"].append(built - start)
+        stages["solve_s"].append(solved - built)
+        stages["extract_s"].append(extracted - solved)
+        stages["total_s"].append(extracted - start)
+    return {stage: statistics.median(values) for stage, values in stages.items()}
+
+def bench_sensitivity(repeats: int = 3) -> Dict:
+    """
+    Повний час sensitivity_analysis (друк перенаправляється).
+    """
+    import task1
+
+    def run_quietly():
+        with contextlib.redirect_stdout(io.StringIO()):
+            task1.sensitivity_analysis()
+
+    return {"seconds": _best_time(run_quietly, repeats)}
+
+def bench_sensitivity_accuracy(n_problems: int = 40, seed: int = 0) -> Dict:
+    """
+    Регресійна перевірка lp_sensitivity на випадкових LP (m, n <= 6).
+
+    Тіньові ціни порівнюються з двоїстими оцінками scipy.optimize.linprog, а
+    прогноз «ціна × зміна запасу» всередині звітного діапазону - з повторним
+    розв'язанням. Усі лічильники помилок мають бути нульовими.
+    """
+    import numpy as np
+    from scipy.optimize import linprog
+    import task1
+
+    rng = np.random.default_rng(seed)
+    checked = price_errors = inverted_ranges = prediction_errors = 0
+    start = time.perf_counter()
+    while checked < n_problems:
+        m, n = rng.integers(1, 7, size=2)
+        recipes = np.round(rng.uniform(0, 5, (m, n)), 2)
+        recipes[rng.random((m, n)) < 0.3] = 0
+        capacities = np.round(rng.uniform(10, 100, m), 2)
+        objective = np.round(rng.uniform(0, 5, n), 2)
+        reference = linprog(-objective, A_ub=recipes, b_ub=capacities, method="highs")
+        if reference.status != 0:
+            continue
+        checked += 1
+
+        report = task1.lp_sensitivity(recipes, capacities, objective,
+                                      product_names=[f"x_{j}" for j in range(n)],
+                                      resource_names=[f"c_{i}" for i in range(m)])
+        prices = np.array([data["shadow_price"] for data in report["resources"].values()])
+        price_errors += int(not np.allclose(prices, -reference.ineqlin.marginals, atol=1e-7))
+
+        for i, data in enumerate(report["resources"].values()):
+            lower, upper = data["rhs_range"]
+            inverted_ranges += int(lower > upper)
+            for target in ((lower + capacities[i]) / 2 if np.isfinite(lower) else capacities[i] - 5,
+                           capacities[i] + min(upper - capacities[i], 10) / 2):
+                changed = capacities.copy()
+                changed[i] = target
+                resolved = linprog(-objective, A_ub=recipes, b_ub=changed, method="highs")
+                predicted = -reference.fun + data["shadow_price"] * (target - capacities[i])
+                if resolved.status == 0 and abs(-resolved.fun - predicted) > 1e-6 * max(1.0, abs(reference.fun)):
+                    prediction_errors += 1
+
+    return {
+        "problems": checked,
+        "price_errors": price_errors,
+        "inverted_ranges": inverted_ranges,
+        "prediction_errors": prediction_errors,
+        "seconds": time.perf_counter() - start,
+    }
+
+def bench_scenario_sweep(n_scenarios: int = 40) -> Dict:
+    """
+    Час scenario_sweep (одна модель) порівняно з побудовою моделі для кожного сценарію.
+    """
+    import pulp
+    import task1
+
+    scenarios = [{"capacities": task1.CAPACITIES * (1 + 0.01 * k)} for k in range(n_scenarios)]
+
+    def rebuild_each():
+        for scenario in scenarios:
+            model, _, _ = task1.build_production_model(capacities=scenario["capacities"])
+            model.solve(pulp.PULP_CBC_CMD(msg=False))
+
+    return {
+        "scenarios": n_scenarios,
+        "rebuild_s": _best_time(rebuild_each, 1),
+        "sweep_s": _best_time(lambda: task1.scenario_sweep(scenarios), 1),
+    }
+
+def bench_solver_backends(repeats: int = 20) -> Dict:
+    """
+    Середній час одного розв'язання задачі 1 для кожного розв'язувача:
+    CBC окремим процесом і HiGHS у поточному процесі.
+    """
+    import task1
+
+    results = {}
+    for solver in task1.SOLVERS:
+        # Перший виклик прогріває імпорти і не враховується
+        task1.solve_production(solver=solver)
+        seconds = _best_time(lambda: [task1.solve_production(solver=solver) for _ in range(repeats)], 3)
+        results[solver] = {"per_solve_s": seconds / repeats}
+    results["saving_per_solve_s"] = results["cbc"]["per_solve_s"] - results["highs"]["per_solve_s"]
+    return results
+
+def bench_resource_usage(n_plans: int = 10**6, repeats: int = 3) -> Dict:
+    """
+    Пропускна здатність analyze_resource_usage_batch (планів/с).
+    """
+    import numpy as np
+    import task1
+
+    plans = np.random.default_rng(0).integers(0, 50, size=(n_plans, len(task1.PRODUCTS)))
+    seconds = _best_time(lambda: task1.analyze_resource_usage_batch(plans), repeats)
+    return {"plans": n_plans, "seconds": seconds, "plans_per_s": n_plans / seconds}
+
+def bench_compiled_integrand(n: int = 10**6, repeats: int = 3) -> Dict:
+    """
+    Геометричний метод для x² sin(x): скалярна функція Python, векторизована
+    функція NumPy та скомпільований вираз.
+    """
+    import math
+    import numpy as np
+    import task2
+
+    integrands = {
+        "scalar": lambda x: x * x * math.sin(x),
+        "numpy": lambda x: x ** 2 * np.sin(x),
+        "compiled": "x**2 * sin(x)",
+    }
+    results = {}
+    for name, func in integrands.items():
+        seconds = _best_time(lambda: task2.monte_carlo_geometric_method(func, 0, 2, n, seed=0), repeats)
+        results[name] = {"seconds": seconds, "samples_per_s": n / seconds}
+    return results
+
+BENCHMARKS = {
+    "cold_start": bench_cold_start,
+    "monte_carlo": bench_monte_carlo,
+    "history_memory": bench_history_memory,
+    "task1_latency": bench_task1_latency,
+    "sensitivity": bench_sensitivity,
+    "sensitivity_accuracy": bench_sensitivity_accuracy,
+    "scenario_sweep": bench_scenario_sweep,
+    "solver_backends": bench_solver_backends,
+    "resource_usage": bench_resource_usage,
+    "compiled_integrand": bench_compiled_integrand,
+}
+
+def _git_commit() -> Optional[str]:
+    """
+    Поточний коміт git (None, якщо недоступний).
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _run_one(name: str, profile_dir: Optional[str], trace_memory: bool) -> Dict:
+    """
+    Виконує один бенчмарк з необов'язковими cProfile та tracemalloc.
+    """
+    profiler = None
+    if profile_dir is not None:
+        import cProfile
+        os.makedirs(profile_dir, exist_ok=True)
+        profiler = cProfile.Profile()
+    if trace_memory:
+        tracemalloc.start()
+
+    if profiler is not None:
+        profiler.enable()
+    result = BENCHMARKS[name]()
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(profile_dir, f"{name}.prof"))
+
+    if trace_memory:
+        result["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+def _flatten(report: Dict, prefix: str = "") -> Dict[str, float]:
+    """
+    Перетворює вкладені результати на словник {"шлях.до.значення": число}.
+    """
+    flat = {}
+    for key, value in report.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+def compare_reports(baseline: Dict, current: Dict) -> Dict[str, float]:
+    """
+    Відношення поточних результатів до базових (current / baseline) для
+    спільних числових метрик. Для часу та пам'яті > 1 означає погіршення,
+    для samples_per_s - покращення.
+    """
+    old = _flatten(baseline.get("results", {}))
+    new = _flatten(current.get("results", {}))
+    return {path: new[path] / old[path] for path in sorted(old.keys() & new.keys()) if old[path]}
+
+def run(names: Optional[List[str]] = None, profile_dir: Optional[str] = None,
+        trace_memory: bool = False) -> Dict:
+    """
+    Виконує вибрані бенчмарки (за замовчуванням усі).
+
+    Args:
+        names: Назви бенчмарків з BENCHMARKS
+        profile_dir: Каталог для дампів cProfile (<назва>.prof)
+        trace_memory: Записати пікову пам'ять кожного бенчмарку (tracemalloc)
+
+    Returns:
+        Dict: Результати з метаданими середовища
+    """
+    names = names or list(BENCHMARKS)
+    return {
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.time(),
+        "results": {name: _run_one(name, profile_dir, trace_memory) for name in names},
+    }
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входу командного рядка.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Бенчмарки завдань 1 та 2")
+    parser.add_argument("names", nargs="*", metavar="NAME",
+                        help=f"бенчмарки для запуску: {', '.join(BENCHMARKS)} (за замовчуванням усі)")
+    parser.add_argument("--output", help="файл для результатів JSON (за замовчуванням stdout)")
+    parser.add_argument("--baseline", help="JSON попереднього запуску для порівняння")
+    parser.add_argument("--profile", metavar="DIR", help="каталог для дампів cProfile")
+    parser.add_argument("--tracemalloc", action="store_true", help="записати пікову пам'ять")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"невідомі бенчмарки: {', '.join(unknown)}")
+
+    current = run(args.names, profile_dir=args.profile, trace_memory=args.tracemalloc)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            current["comparison"] = compare_reports(json.load(file), current)
+
+    report = json.dumps(current, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
@@ -0,0 +1,246 @@
+"""
+Кешування результатів обчислень.
+
+LRU-кеш у пам'яті з необов'язковим сховищем на диску. Ключі будуються зі
+стабільної ідентичності функції-інтегранда та параметрів обчислення, тому
+однакові запити (у тому числі з різних запусків програми) стають пошуком у кеші.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import types
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+def _code_fingerprint(code: types.CodeType) -> bytes:
+    """
+    Байтове представлення об'єкта коду без адрес пам'яті (вкладені функції рекурсивно).
+    """
+    parts = [code.co_code, repr(code.co_names).encode()]
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            parts.append(_code_fingerprint(const))
+        else:
+            parts.append(repr(const).encode())
+    return b"\0".join(parts)
+
+class UncacheableError(ValueError):
+    """
+    Значення не має стабільної ідентичності (наприклад, repr містить адресу
+    пам'яті), тому результат з ним не можна надійно кешувати.
+    """
+
+# Типи, repr яких повний і однаковий між запусками
+_STABLE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+def integrand_key(func, _seen: Optional[set] = None) -> str:
+    """
+    Стабільна ідентичність функції для ключа кешу.
+
+    Для звичайних функцій враховуються ім'я, байт-код, константи, значення за
+    замовчуванням, змінні замикання та глобальні змінні модуля, на які
+    посилається код, тож зміна тіла функції або даних, які вона використовує,
+    змінює ключ. Об'єкти з атрибутом expression (скомпільовані вирази)
+    ідентифікуються виразом.
+
+    Args:
+        func: Функція, ufunc NumPy, functools.partial або об'єкт з expression
+
+    Returns:
+        str: Шістнадцятковий хеш SHA-256
+
+    Raises:
+        UncacheableError: Функція залежить від значення без стабільної ідентичності
+    """
+    seen = set() if _seen is None else _seen
+    digest = hashlib.sha256()
+    expression = getattr(func, "expression", None)
+    if isinstance(expression, str):
+        digest.update(b"expr:" + expression.encode())
+    elif isinstance(func, types.FunctionType):
+        digest.update(f"{func.__module__}.{func.__qualname__}".encode())
+        if id(func) in seen:
+            # Рекурсивне посилання: достатньо імені
+            return hashlib.sha256(b"recursive:" + digest.digest()).hexdigest()
+        seen.add(id(func))
+        digest.update(_code_fingerprint(func.__code__))
+        digest.update(repr(_canonical(func.__defaults__ or (), seen)).encode())
+        for cell in func.__closure__ or ():
+            digest.update(repr(_canonical(cell.cell_contents, seen)).encode())
+        for name in _global_names(func.__code__):
+            if name in func.__globals__:
+                digest.update(f"{name}=".encode())
+                digest.update(repr(_canonical(func.__globals__[name], seen)).encode())
+    elif hasattr(func, "func") and hasattr(func, "args"):
+        # functools.partial
+        digest.update(integrand_key(func.func, seen).encode())
+        digest.update(repr(_canonical((func.args, func.keywords), seen)).encode())
+    else:
+        name = getattr(func, "__qualname__", None) or getattr(func, "__name__", None)
+        if name is None:
+            raise UncacheableError(f"Об'єкт без стабільної ідентичності: {type(func).__name__}")
+        digest.update(f"{type(func).__name__}:{getattr(func, '__module__', '')}:{name}".encode())
+    return digest.hexdigest()
+
+def _global_names(code: types.CodeType) -> list:
+    """
+    Імена, на які посилається код (разом із вкладеними функціями).
+    """
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.extend(_global_names(const))
+    return sorted(set(names))
+
+def _canonical(value: Any, _seen: Optional[set] = None) -> Any:
+    """
+    Перетворює параметр на структуру зі стабільним і повним repr.
+
+    Raises:
+        UncacheableError: Для об'єктів, repr яких неповний або залежить від адреси пам'яті
+    """
+    if isinstance(value, _STABLE_TYPES):
+        return value
+    if isinstance(value, types.ModuleType):
+        return ("module", value.__name__)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _canonical(v, _seen)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v, _seen) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return ("set", tuple(sorted(repr(_canonical(v, _seen)) for v in value)))
+    if hasattr(value, "tobytes") and hasattr(value, "dtype"):
+        # Масиви та скаляри NumPy: repr великих масивів скорочується, тому хешуємо вміст
+        return ("ndarray", str(value.dtype), getattr(value, "shape", ()),
+                hashlib.sha256(value.tobytes()).hexdigest())
+    if callable(value):
+        return ("callable", integrand_key(value, _seen))
+    text = repr(value)
+    if " at 0x" in text or text.startswith("<"):
+        raise UncacheableError(f"Значення без стабільного repr: {type(value).__name__}")
+    return (type(value).__name__, text)
+
+def make_key(*parts: Any) -> str:
+    """
+    Будує ключ кешу з довільних параметрів (числа, рядки, послідовності,
+    словники, масиви NumPy, функції).
+    """
+    return hashlib.sha256(repr(_canonical(parts)).encode()).hexdigest()
+
+class ResultCache:
+    """
+    LRU-кеш результатів з необов'язковим сховищем на диску.
+
+    Операції з кешем захищені блокуванням, тому один кеш можна використовувати
+    з кількох потоків; обчислення в get_or_compute виконується поза блокуванням.
+
+    Args:
+        maxsize: Максимальна кількість записів у пам'яті
+        path: Каталог для збереження записів на диску (None - лише в пам'яті)
+        maxbytes: Максимальний сумарний розмір записів у пам'яті (розмір запису -
+            довжина його pickle); None - без обмеження
+    """
+
+    def __init__(self, maxsize: int = 256, path: Optional[str] = None,
+                 maxbytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.pkl")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Повертає значення за ключем (з пам'яті або з диска) або default.
+        """
+        with self._lock:
+            return self._get(key, default)
+
+    def _get(self, key: str, default: Any) -> Any:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        if self.path is not None:
+            try:
+                with open(self._file(key), "rb") as file:
+                    data = file.read()
+                value = pickle.loads(data)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                self._remember(key, value, len(data))
+                self.hits += 1
+                return value
+        self.misses += 1
+        return default
+
+    def set(self, key: str, value: Any):
+        """
+        Зберігає значення в пам'яті та, якщо задано path, на диску.
+        """
+        data = None
+        if self.path is not None or self.maxbytes is not None:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, value, None if data is None else len(data))
+        if self.path is not None:
+            # Запис через унікальний тимчасовий файл, щоб паралельні читачі не бачили
+            # неповних даних, а одночасні записи з потоків і процесів не перетиналися
+            descriptor, temporary = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "wb") as file:
+                    file.write(data)
+                os.replace(temporary, self._file(key))
+            except BaseException:
+                os.unlink(temporary)
+                raise
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Повертає значення з кешу або обчислює його через compute() і зберігає.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        """
+        Очищає кеш у пам'яті (записи на диску залишаються).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def _remember(self, key: str, value: Any, size: Optional[int] = None):
+        self.nbytes += (size or 0) - self._sizes.pop(key, 0)
+        if size is not None:
+            self._sizes[key] = size
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while self._entries and (len(self._entries) > self.maxsize or
+                                 (self.maxbytes is not None and self.nbytes > self.maxbytes)):
+            evicted, _ = self._entries.popitem(last=False)
+            self.nbytes -= self._sizes.pop(evicted, 0)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or (self.path is not None and os.path.exists(self._file(key)))
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,231 @@
+"""
+Скомпільовані вирази для підінтегральних функцій.
+
+Рядок на кшталт "x**2 * sin(x)" (або готове AST) перевіряється, а потім один
+раз компілюється в послідовність ufunc NumPy з параметром out=: проміжні
+результати записуються в заздалегідь виділені буфери, що перевикористовуються
+між викликами, а останній крок пише одразу в масив out. Тож обчислення на
+блоці точок не виділяє нової пам'яті, а скалярних викликів Python немає зовсім.
+
+    func = compile_integrand("x**2 * sin(x)")
+    func(np.linspace(0, 1, 5))
+    func.y_range(0, 2)      # кешована оцінка діапазону значень на сітці
+"""
+
+import ast
+import threading
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+# Дозволені функції: назва -> (ufunc, кількість аргументів)
+FUNCTIONS = {
+    "sin": (np.sin, 1), "cos": (np.cos, 1), "tan": (np.tan, 1),
+    "arcsin": (np.arcsin, 1), "arccos": (np.arccos, 1), "arctan": (np.arctan, 1),
+    "asin": (np.arcsin, 1), "acos": (np.arccos, 1), "atan": (np.arctan, 1),
+    "sinh": (np.sinh, 1), "cosh": (np.cosh, 1), "tanh": (np.tanh, 1),
+    "exp": (np.exp, 1), "log": (np.log, 1), "log2": (np.log2, 1), "log10": (np.log10, 1),
+    "sqrt": (np.sqrt, 1), "abs": (np.abs, 1), "floor": (np.floor, 1), "ceil": (np.ceil, 1),
+    "arctan2": (np.arctan2, 2), "atan2": (np.arctan2, 2), "hypot": (np.hypot, 2),
+    "minimum": (np.minimum, 2), "maximum": (np.maximum, 2),
+    "min": (np.minimum, 2), "max": (np.maximum, 2),
+}
+
+CONSTANTS = {"pi": np.pi, "e": np.e}
+
+# Скільки інтервалів y_range пам'ятає кожна скомпільована функція
+RANGE_CACHE_SIZE = 32
+
+_OPERATORS = {
+    ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply,
+    ast.Div: np.divide, ast.Pow: np.power, ast.Mod: np.mod,
+}
+
+class _Compiler:
+    """
+    Перетворює AST виразу на програму: список інструкцій (ufunc, операнди, регістр).
+
+    Операнд - ("x",) для змінної, ("c", число) для константи або ("r", номер)
+    для буфера-регістру. Константні підвирази обчислюються одразу, а буфер
+    операнда перевикористовується для результату, тому регістрів потрібно
+    стільки, скільки проміжних результатів живе одночасно.
+    """
+
+    def __init__(self, variable: str):
+        self.variable = variable
+        self.instructions: List[Tuple] = []
+        self.n_registers = 0
+        self._free: List[int] = []
+
+    def _register(self, operands) -> Tuple[str, int]:
+        registers = [operand[1] for operand in operands if operand[0] == "r"]
+        if registers:
+            self._free.extend(registers[1:])
+            return ("r", registers[0])
+        if self._free:
+            return ("r", self._free.pop())
+        self.n_registers += 1
+        return ("r", self.n_registers - 1)
+
+    def _apply(self, ufunc, operands) -> Tuple:
+        if all(operand[0] == "c" for operand in operands):
+            return ("c", float(ufunc(*(operand[1] for operand in operands))))
+        target = self._register(operands)
+        self.instructions.append((ufunc, tuple(operands), target[1]))
+        return target
+
+    def emit(self, node: ast.AST) -> Tuple:
+        if isinstance(node, ast.Expression):
+            return self.emit(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+                and not isinstance(node.value, bool):
+            return ("c", float(node.value))
+        if isinstance(node, ast.Name):
+            if node.id == self.variable:
+                return ("x",)
+            if node.id in CONSTANTS:
+                return ("c", CONSTANTS[node.id])
+            raise ValueError(f"Невідома назва у виразі: {node.id!r}")
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            operand = self.emit(node.operand)
+            return operand if isinstance(node.op, ast.UAdd) else self._apply(np.negative, [operand])
+        if isinstance(node, ast.BinOp) and type(node.op) in _OPERATORS:
+            left = self.emit(node.left)
+            right = self.emit(node.right)
+            # Найчастіші степені - окремими швидшими ufunc
+            if isinstance(node.op, ast.Pow) and right == ("c", 2.0):
+                return self._apply(np.square, [left])
+            if isinstance(node.op, ast.Pow) and right == ("c", 0.5):
+                return self._apply(np.sqrt, [left])
+            return self._apply(_OPERATORS[type(node.op)], [left, right])
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            if node.func.id not in FUNCTIONS:
+                raise ValueError(f"Невідома функція у виразі: {node.func.id!r}")
+            ufunc, arity = FUNCTIONS[node.func.id]
+            if len(node.args) != arity:
+                raise ValueError(f"Функція {node.func.id} приймає {arity} аргумент(и)")
+            return self._apply(ufunc, [self.emit(arg) for arg in node.args])
+        raise ValueError(f"Недозволена конструкція у виразі: {ast.dump(node)[:60]}")
+
+class CompiledIntegrand:
+    """
+    Векторизована функція однієї змінної, скомпільована з виразу.
+
+    Атрибут expression (нормалізований текст виразу) ідентифікує функцію
+    для кешу результатів (див. cache.integrand_key). Об'єкт серіалізується
+    pickle як текст виразу, тож підходить і для паралельних обчислень.
+
+    Args:
+        source: Рядок з виразом або AST (ast.Expression чи вузол виразу)
+        variable: Назва змінної у виразі
+    """
+
+    def __init__(self, source: Union[str, ast.AST], variable: str = "x"):
+        if isinstance(source, str):
+            tree = ast.parse(source.strip(), mode="eval")
+        elif isinstance(source, ast.Expression):
+            tree = source
+        elif isinstance(source, ast.expr):
+            tree = ast.Expression(body=source)
+        else:
+            raise TypeError("Вираз має бути рядком або AST")
+
+        compiler = _Compiler(variable)
+        self._result = compiler.emit(tree)
+        self._instructions = compiler.instructions
+        self._n_registers = compiler.n_registers
+        self.expression = ast.unparse(tree)
+        self.variable = variable
+        self._local = threading.local()
+        # Обмежений кеш діапазонів: у резидентному сервісі інтервали можуть не повторюватися
+        self._range = lru_cache(maxsize=RANGE_CACHE_SIZE)(self._grid_range)
+
+    def _registers(self, size: int) -> List[np.ndarray]:
+        """
+        Буфери проміжних результатів довжини size (окремі для кожного потоку;
+        виділяються заново лише при збільшенні size).
+        """
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None or buffers.shape[1] < size:
+            buffers = np.empty((self._n_registers, max(size, 1)))
+            self._local.buffers = buffers
+        return [buffers[i, :size] for i in range(self._n_registers)]
+
+    def __call__(self, x, out: Optional[np.ndarray] = None):
+        """
+        Обчислює вираз на x (скаляр або масив).
+
+        Args:
+            x: Значення змінної
+            out: Масив форми x для результату (без виділення пам'яті)
+
+        Returns:
+            Значення виразу (float для скалярного x)
+        """
+        values = np.asarray(x, dtype=float)
+        flat = values.reshape(-1)
+        result = np.empty(flat.size) if out is None else out.reshape(-1)
+        if result.size != flat.size:
+            raise ValueError("Розмір out не збігається з розміром x")
+
+        registers = self._registers(flat.size)
+        last = len(self._instructions) - 1
+        for step, (ufunc, operands, target) in enumerate(self._instructions):
+            arguments = [flat if kind == "x" else registers[rest[0]] if kind == "r" else rest[0]
+                         for kind, *rest in operands]
+            ufunc(*arguments, out=result if step == last else registers[target])
+
+        if self._result[0] == "x":
+            np.copyto(result, flat)
+        elif self._result[0] == "c":
+            result.fill(self._result[1])
+
+        if values.ndim == 0:
+            return float(result[0])
+        if out is not None:
+            return out
+        return result.reshape(values.shape)
+
+    def _grid_range(self, a: float, b: float, points: int) -> Tuple[float, float]:
+        values = self(np.linspace(a, b, points))
+        return float(np.min(values)), float(np.max(values))
+
+    def y_range(self, a: float, b: float, points: int = 1000) -> Tuple[float, float]:
+        """
+        Мінімум і максимум функції на сітці з points точок на [a, b].
+
+        Це оцінка, а не гарантована межа: для немонотонної функції екстремум між
+        вузлами сітки може бути більшим за знайдений, і тоді геометричний метод,
+        що бере максимум за висоту прямокутника, зміщує оцінку вниз.
+
+        Результати для останніх RANGE_CACHE_SIZE інтервалів кешуються, тож повторні
+        виклики (наприклад, у геометричному методі) не обчислюють функцію знову.
+        """
+        return self._range(float(a), float(b), int(points))
+
+    def __reduce__(self):
+        return (CompiledIntegrand, (self.expression, self.variable))
+
+    def __repr__(self) -> str:
+        return f"CompiledIntegrand({self.expression!r})"
+
+@lru_cache(maxsize=128)
+def _compile_cached(expression: str, variable: str) -> CompiledIntegrand:
+    return CompiledIntegrand(expression, variable)
+
+def compile_integrand(source: Union[str, ast.AST], variable: str = "x") -> CompiledIntegrand:
+    """
+    Компілює вираз у CompiledIntegrand. Однакові рядки повертають той самий
+    об'єкт, тож буфери та кешовані діапазони значень спільні.
+
+    Args:
+        source: Рядок з виразом або AST
+        variable: Назва змінної у виразі
+
+    Returns:
+        CompiledIntegrand: Скомпільована функція
+    """
+    if isinstance(source, str):
+        return _compile_cached(source.strip(), variable)
+    return CompiledIntegrand(source, variable)
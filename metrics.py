@@ -0,0 +1,197 @@
+"""
+Метрики виконання: таймери, лічильники та структуровані події.
+
+За замовчуванням збір вимкнено: timer() повертає спільний порожній контекст,
+clock() - None, а count(), event() і record() одразу повертаються, тому
+інструментований код майже нічого не втрачає. Після enable() кожен виміряний
+виклик оновлює зведену статистику таймера і додає подію з його полями (статус
+розв'язувача, кількість точок, стандартна похибка тощо). Результат
+експортується у JSON.
+
+    import metrics
+    metrics.enable()
+    ...
+    metrics.export("metrics.json")
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+_enabled = False
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_timers: Dict[str, Dict[str, float]] = {}
+_events = deque(maxlen=100_000)
+
+def enable(max_events: int = 100_000):
+    """
+    Вмикає збір метрик.
+
+    Args:
+        max_events: Скільки останніх подій зберігати
+    """
+    global _enabled, _events
+    with _lock:
+        if _events.maxlen != max_events:
+            _events = deque(_events, maxlen=max_events)
+        _enabled = True
+
+def disable():
+    """
+    Вимикає збір метрик (зібране зберігається до reset()).
+    """
+    global _enabled
+    _enabled = False
+
+def is_enabled() -> bool:
+    return _enabled
+
+def reset():
+    """
+    Очищає всі лічильники, таймери та події.
+    """
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+        _events.clear()
+
+def count(name: str, value: float = 1):
+    """
+    Збільшує лічильник name на value.
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+def event(name: str, **fields):
+    """
+    Записує структуровану подію з довільними полями.
+    """
+    if not _enabled:
+        return
+    data = {"name": name, "timestamp": time.time(), **fields}
+    with _lock:
+        _events.append(data)
+
+def clock() -> Optional[float]:
+    """
+    Момент початку вимірювання для record() або None, якщо збір вимкнено.
+    """
+    return time.perf_counter() if _enabled else None
+
+def record(name: str, started: Optional[float], **fields):
+    """
+    Записує виміряний виклик: оновлює статистику таймера name і додає подію
+    з тривалістю та полями. Якщо серед полів є samples, додається також samples_per_s.
+
+        started = metrics.clock()
+        ...
+        metrics.record("task2.monte_carlo", started, samples=n)
+
+    Args:
+        name: Назва таймера
+        started: Результат clock() (None - нічого не записується)
+        **fields: Поля події
+    """
+    if started is None or not _enabled:
+        return
+    seconds = time.perf_counter() - started
+    data = {"name": name, "timestamp": time.time(), "seconds": seconds, **fields}
+    if fields.get("samples") and seconds > 0:
+        data["samples_per_s"] = fields["samples"] / seconds
+    with _lock:
+        stats = _timers.get(name)
+        if stats is None:
+            _timers[name] = {"count": 1, "total_s": seconds, "min_s": seconds, "max_s": seconds}
+        else:
+            stats["count"] += 1
+            stats["total_s"] += seconds
+            stats["min_s"] = min(stats["min_s"], seconds)
+            stats["max_s"] = max(stats["max_s"], seconds)
+        _events.append(data)
+
+class _Timer:
+    """
+    Контекст вимірювання одного виклику; поля, додані через set(), записуються
+    разом із тривалістю (див. record).
+    """
+
+    __slots__ = ("name", "fields", "started")
+
+    def __init__(self, name: str, fields: Dict):
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is not None:
+            self.fields["error"] = exc_info[0].__name__
+        record(self.name, self.started, **self.fields)
+        return False
+
+class _NullTimer:
+    """
+    Порожній контекст для вимкненого збору метрик.
+    """
+
+    __slots__ = ()
+
+    def set(self, **fields):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def timer(name: str, **fields):
+    """
+    Контекстний менеджер для вимірювання часу виконання блоку.
+
+        with metrics.timer("task1.solve", solver="cbc") as timing:
+            ...
+            timing.set(status=status)
+
+    Args:
+        name: Назва таймера
+        **fields: Початкові поля події
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name, fields)
+
+def snapshot() -> Dict:
+    """
+    Копія зібраних метрик: counters, timers (count, total_s, min_s, max_s, mean_s)
+    та events.
+    """
+    with _lock:
+        timers = {name: {**stats, "mean_s": stats["total_s"] / stats["count"]}
+                  for name, stats in _timers.items()}
+        return {"counters": dict(_counters), "timers": timers, "events": list(_events)}
+
+def export(path: str, extra: Optional[Dict] = None):
+    """
+    Записує snapshot() у файл JSON.
+
+    Args:
+        path: Шлях до файлу
+        extra: Додаткові поля верхнього рівня (наприклад, параметри запуску)
+    """
+    data = {**(extra or {}), **snapshot()}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2, default=float)
+        file.write("\n")
@@ -0,0 +1,28 @@
+"""
+Паралельне виконання незалежних завдань у пулі процесів.
+
+Спільний помічник для обох задач: сценарії задачі виробництва (task1) та
+частини вибірки методу Монте-Карло (task2) виконуються однаково.
+"""
+
+from typing import List
+
+def run_workers(worker, tasks: List[tuple], workers: int) -> list:
+    """
+    Виконує worker(*task) для кожного завдання: у поточному процесі, якщо
+    workers <= 1 або завдання одне, інакше в пулі процесів. Порядок результатів
+    збігається з порядком tasks.
+
+    Args:
+        worker: Функція рівня модуля (передається в інші процеси через pickle)
+        tasks: Аргументи кожного виклику
+        workers: Кількість процесів
+        
+    Returns:
+        list: Результати worker у порядку tasks
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        return [worker(*task) for task in tasks]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(worker, *zip(*tasks)))
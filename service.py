@@ -0,0 +1,254 @@
+"""
+Резидентний сервіс для пакетних завдань обох задач.
+
+Читає запити у форматі JSON Lines зі stdin або з локального unix-сокета і
+відповідає рядками JSON. Модулі, розв'язувачі та кеші завантажуються один раз
+і залишаються «теплими» між завданнями; завдання виконуються паралельно в
+пулі потоків (розв'язувачі та NumPy звільняють GIL на час обчислень).
+
+Запит:
+    {"id": 1, "task": "production", "params": {"capacities": [100, 50, 30, 40]}}
+    {"id": 2, "task": "integration", "params": {"method": "quad", "a": 0, "b": 2}}
+
+Відповідь (порядок відповідей - порядок завершення завдань):
+    {"id": 1, "ok": true, "result": {...}, "queued_s": 0.0, "latency_s": 0.002}
+
+Запуск:
+    python service.py --concurrency 4 < jobs.jsonl
+    python service.py --socket /tmp/hw10.sock --cache .cache
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+import metrics
+import task1
+import task2
+
+SOLVER_OPTIONS = ("time_limit", "mip_gap", "threads")
+
+# Функції, які можна інтегрувати за назвою
+INTEGRANDS = {"f": task2.f}
+
+def _jsonable(value):
+    """
+    Перетворює результат (масиви та скаляри NumPy, кортежі) на типи JSON.
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return value
+
+def run_production(params: Dict) -> Dict:
+    """
+    Завдання "production": задача виробництва з кешем розв'язків.
+
+    Параметри: recipes, capacities, objective (за замовчуванням - задача про напої),
+    cat, solver, time_limit, mip_gap, threads; relaxed=true - через LP-релаксацію
+    (solve_production_relaxed) замість кешованого розв'язання.
+    """
+    recipes = np.asarray(params["recipes"], dtype=float) if "recipes" in params else None
+    capacities = params.get("capacities")
+    objective = np.asarray(params.get("objective", task1.TOTAL_PRODUCTS), dtype=float)
+    options = {name: params[name] for name in SOLVER_OPTIONS if name in params}
+    solver = params.get("solver", "cbc")
+
+    if params.get("relaxed"):
+        status, plan, path = task1.solve_production_relaxed(recipes, capacities, objective,
+                                                            solver=solver, **options)
+        extra = {"path": path}
+    else:
+        status, plan, cached = task1.solve_production_cached(recipes, capacities, objective,
+                                                             cat=params.get("cat", "Integer"),
+                                                             solver=solver, **options)
+        extra = {"cache": cached}
+    return {"status": status, "plan": plan, "objective": float(objective @ plan), **extra}
+
+def run_integration(params: Dict) -> Dict:
+    """
+    Завдання "integration": інтеграл через task2.cached_integral.
+
+    Параметри: method (один з task2.CACHED_METHODS, за замовчуванням "quad"),
+    func (назва з INTEGRANDS або вираз, напр. "x**2 * sin(x)"), a, b та параметри
+    методу (n, seed, ...). Скомпільовані вирази кешуються між завданнями.
+    Для monte_carlo історія збіжності за замовчуванням не зберігається.
+    """
+    params = dict(params)
+    method = params.pop("method", "quad")
+    name = params.pop("func", "f")
+    func = INTEGRANDS.get(name, name)
+    a = params.pop("a", 0)
+    b = params.pop("b", 2)
+    if method == "monte_carlo":
+        params.setdefault("history", "none")
+    return {"method": method, "value": task2.cached_integral(method, func, a, b, **params)}
+
+TASKS = {
+    "production": run_production,
+    "integration": run_integration,
+}
+
+def handle_job(line: str) -> Dict:
+    """
+    Виконує одне завдання з рядка JSON. Помилки повертаються у відповіді, а не
+    зупиняють сервіс.
+    """
+    started = metrics.clock()
+    job_id = task = None
+    try:
+        job = json.loads(line)
+        job_id = job.get("id")
+        task = job.get("task")
+        if task not in TASKS:
+            raise ValueError(f"Невідоме завдання: {task!r}. Допустимі: {tuple(TASKS)}")
+        result = TASKS[task](job.get("params", {}))
+    except Exception as error:
+        metrics.record("service.job", started, task=task, ok=False)
+        return {"id": job_id, "ok": False, "error": f"{type(error).__name__}: {error}"}
+    metrics.record("service.job", started, task=task, ok=True)
+    return {"id": job_id, "ok": True, "result": _jsonable(result)}
+
+def warm_up():
+    """
+    Завантажує важкі модулі (PuLP, SciPy) до надходження першого завдання.
+    """
+    import pulp
+    import scipy.integrate
+    import scipy.optimize
+
+    task1.solve_production(solver="highs")
+
+async def serve_lines(read_line: Callable[[], Awaitable[str]], write_line: Callable[[str], Awaitable[None]],
+                      executor: ThreadPoolExecutor, semaphore: asyncio.Semaphore,
+                      latencies: List[float]):
+    """
+    Обробляє потік запитів, доки read_line не поверне порожній рядок.
+
+    Кількість одночасних завдань обмежує semaphore: наступний рядок читається
+    лише після звільнення місця, тож черга не росте необмежено.
+    """
+    loop = asyncio.get_running_loop()
+    pending = set()
+
+    async def process(line: str, received: float):
+        try:
+            started = time.perf_counter()
+            response = await loop.run_in_executor(executor, handle_job, line)
+            finished = time.perf_counter()
+            response["queued_s"] = started - received
+            response["latency_s"] = finished - received
+            latencies.append(finished - received)
+            await write_line(json.dumps(response, ensure_ascii=False))
+        finally:
+            semaphore.release()
+
+    while True:
+        line = await read_line()
+        if not line:
+            break
+        if not line.strip():
+            continue
+        received = time.perf_counter()
+        await semaphore.acquire()
+        task = asyncio.create_task(process(line, received))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    if pending:
+        await asyncio.gather(*pending)
+
+async def serve(socket_path: Optional[str] = None, concurrency: int = 4) -> List[float]:
+    """
+    Запускає сервіс: зі stdin/stdout або на unix-сокеті.
+
+    Args:
+        socket_path: Шлях до unix-сокета (None - stdin/stdout; сервіс завершується
+            після кінця вводу)
+        concurrency: Максимальна кількість одночасних завдань
+
+    Returns:
+        List[float]: Затримки виконаних завдань (с)
+    """
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    if socket_path is None:
+        async def read_line() -> str:
+            return await asyncio.to_thread(sys.stdin.readline)
+
+        async def write_line(text: str):
+            sys.stdout.write(text + "\n")
+            sys.stdout.flush()
+
+        await serve_lines(read_line, write_line, executor, semaphore, latencies)
+    else:
+        async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            async def read_line() -> str:
+                return (await reader.readline()).decode()
+
+            async def write_line(text: str):
+                writer.write(text.encode() + b"\n")
+                await writer.drain()
+
+            try:
+                await serve_lines(read_line, write_line, executor, semaphore, latencies)
+            finally:
+                writer.close()
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = await asyncio.start_unix_server(connection, path=socket_path)
+        async with server:
+            await server.serve_forever()
+
+    executor.shutdown()
+    return latencies
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входу командного рядка.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Резидентний сервіс завдань 1 та 2 (JSON Lines)")
+    parser.add_argument("--socket", help="шлях до unix-сокета (за замовчуванням stdin/stdout)")
+    parser.add_argument("--concurrency", type=int, default=4, help="максимум одночасних завдань")
+    parser.add_argument("--cache", metavar="DIR", help="каталог для збереження кешів на диску")
+    parser.add_argument("--metrics", metavar="FILE", help="записати метрики виконання у файл JSON при завершенні")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency має бути не менше 1")
+
+    if args.cache:
+        task1.configure_solution_cache(path=os.path.join(args.cache, "production"))
+        task2.configure_cache(path=os.path.join(args.cache, "integration"))
+    if args.metrics:
+        metrics.enable()
+    warm_up()
+
+    try:
+        latencies = asyncio.run(serve(args.socket, args.concurrency))
+    except KeyboardInterrupt:
+        latencies = []
+    if args.metrics:
+        metrics.export(args.metrics, {"argv": sys.argv[1:] if argv is None else argv})
+    if latencies:
+        print(f"Завдань: {len(latencies)}, середня затримка: {np.mean(latencies) * 1000:.2f} мс, "
+              f"максимальна: {max(latencies) * 1000:.2f} мс", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
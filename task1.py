@@ -6,54 +6,541 @@
 при обмежених ресурсах, використовуючи лінійне програмування (PuLP).
 """
 
-import pulp
-from typing import Dict, Tuple
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from cache import ResultCache, make_key
+from parallel import run_workers
+import metrics
 
-def solve_production_optimization():
+# Дані задачі у матричному вигляді
+PRODUCTS = ["Лимонад", "Фруктовий сік"]
+VARIABLE_NAMES = ["Lemonade", "Fruit_Juice"]
+RESOURCES = ["Вода", "Цукор", "Лимонний сік", "Фруктове пюре"]
+CONSTRAINT_NAMES = ["Water_Constraint", "Sugar_Constraint",
+                    "Lemon_Juice_Constraint", "Fruit_Puree_Constraint"]
+
+# Рецепти: рядок - ресурс, стовпець - продукт (витрата ресурсу на одиницю продукту)
+RECIPES = np.array([
+    [2, 1],  # Вода: Лимонад 2 од., Фруктовий сік 1 од.
+    [1, 0],  # Цукор: тільки Лимонад
+    [1, 0],  # Лимонний сік: тільки Лимонад
+    [0, 2],  # Фруктове пюре: тільки Фруктовий сік
+])
+CAPACITIES = np.array([100, 50, 30, 40])
+
+# Цільові функції: загальна кількість продуктів та прибуток (3 і 2 грн за одиницю)
+TOTAL_PRODUCTS = np.array([1, 1])
+PROFIT = np.array([3, 2])
+
+def _sparse_rows(recipes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Розв'язує задачу оптимізації виробництва напоїв.
+    Представлення матриці рецептів у форматі CSR: (indptr, indices, data).
+    
+    Приймає щільний масив NumPy або розріджену матрицю SciPy.
+    """
+    if hasattr(recipes, "tocsr"):
+        csr = recipes.tocsr()
+        return csr.indptr, csr.indices, csr.data
+    
+    dense = np.asarray(recipes)
+    rows, columns = np.nonzero(dense)
+    indptr = np.searchsorted(rows, np.arange(dense.shape[0] + 1))
+    return indptr, columns, dense[rows, columns]
+
+def build_production_model(recipes=None, capacities=None, objective=None,
+                           variable_names: Optional[List[str]] = None,
+                           constraint_names: Optional[List[str]] = None,
+                           cat: str = 'Integer',
+                           name: str = "Production_Optimization"):
+    """
+    Будує модель лінійного програмування за матрицею рецептів.
+    
+    Вирази будуються напряму з ненульових коефіцієнтів (LpAffineExpression),
+    без поелементного додавання через +=, тому побудова лінійна за кількістю
+    ненульових елементів навіть для тисяч продуктів і сотень ресурсів.
     
+    Args:
+        recipes: Матриця (ресурси × продукти), щільна або розріджена (за замовчуванням RECIPES)
+        capacities: Доступна кількість кожного ресурсу (за замовчуванням CAPACITIES)
+        objective: Коефіцієнти цільової функції (за замовчуванням TOTAL_PRODUCTS)
+        variable_names: Імена змінних (за замовчуванням VARIABLE_NAMES або x_0, x_1, ...)
+        constraint_names: Імена обмежень (за замовчуванням CONSTRAINT_NAMES або c_0, c_1, ...)
+        cat: Тип змінних: 'Integer' або 'Continuous'
+        name: Назва моделі
+        
     Returns:
-        Tuple: (статус_розв'язання, кількість_лимонаду, кількість_фруктового_соку, загальна_кількість)
+        Tuple: (модель, список_змінних, список_обмежень)
     """
+    import pulp
+    
+    started = metrics.clock()
+    recipes = RECIPES if recipes is None else recipes
+    capacities = CAPACITIES if capacities is None else capacities
+    objective = TOTAL_PRODUCTS if objective is None else objective
+    n_resources, n_products = recipes.shape
+    
+    if variable_names is None:
+        variable_names = VARIABLE_NAMES if n_products == len(VARIABLE_NAMES) else \
+            [f"x_{j}" for j in range(n_products)]
+    if constraint_names is None:
+        constraint_names = CONSTRAINT_NAMES if n_resources == len(CONSTRAINT_NAMES) else \
+            [f"c_{i}" for i in range(n_resources)]
     
     # Створюємо модель лінійного програмування (максимізація)
-    model = pulp.LpProblem("Production_Optimization", pulp.LpMaximize)
+    model = pulp.LpProblem(name, pulp.LpMaximize)
     
-    # Змінні рішення (кількість продуктів для виробництва)
-    # x1 - кількість одиниць "Лимонаду"
-    # x2 - кількість одиниць "Фруктового соку"
-    lemonade = pulp.LpVariable("Lemonade", lowBound=0, cat='Integer')
-    fruit_juice = pulp.LpVariable("Fruit_Juice", lowBound=0, cat='Integer')
+    # Змінні рішення (кількість одиниць кожного продукту)
+    variables = [pulp.LpVariable(variable_name, lowBound=0, cat=cat) for variable_name in variable_names]
     
-    # Цільова функція: максимізувати загальну кількість продуктів
-    model += lemonade + fruit_juice, "Total_Products"
+    # Цільова функція
+    objective = np.asarray(objective, dtype=float)
+    nonzero = np.flatnonzero(objective)
+    model.setObjective(pulp.LpAffineExpression(
+        [(variables[j], objective[j]) for j in nonzero.tolist()]))
     
-    # Обмеження ресурсів:
+    # Обмеження ресурсів: рядок i матриці рецептів <= capacities[i]
+    indptr, indices, data = _sparse_rows(recipes)
+    indices = indices.tolist()
+    data = np.asarray(data, dtype=float).tolist()
+    capacities = np.asarray(capacities, dtype=float).tolist()
+    constraints = []
+    for i in range(n_resources):
+        start, stop = indptr[i], indptr[i + 1]
+        expression = pulp.LpAffineExpression(
+            [(variables[j], coefficient) for j, coefficient in zip(indices[start:stop], data[start:stop])])
+        constraint = pulp.LpConstraint(expression, pulp.LpConstraintLE, constraint_names[i], capacities[i])
+        model.addConstraint(constraint, constraint_names[i])
+        constraints.append(constraint)
     
-    # 1. Вода: Лимонад потребує 2 од., Фруктовий сік потребує 1 од., всього доступно 100 од.
-    model += 2 * lemonade + 1 * fruit_juice <= 100, "Water_Constraint"
+    metrics.record("task1.build", started, variables=n_products, constraints=n_resources,
+                   nonzeros=len(data))
+    return model, variables, constraints
+
+def load_production_data(path: str) -> Dict:
+    """
+    Завантажує дані задачі з файлу .npz або .json.
     
-    # 2. Цукор: тільки для Лимонаду потрібна 1 од., всього доступно 50 од.
-    model += 1 * lemonade <= 50, "Sugar_Constraint"
+    Файл містить масиви recipes (ресурси × продукти), capacities, objective
+    та, необов'язково, списки products і resources.
     
-    # 3. Лимонний сік: тільки для Лимонаду потрібна 1 од., всього доступно 30 од.
-    model += 1 * lemonade <= 30, "Lemon_Juice_Constraint"
+    Returns:
+        Dict: Дані з ключами recipes, capacities, objective, products, resources
+    """
+    if path.endswith(".npz"):
+        with np.load(path, allow_pickle=False) as archive:
+            raw = {key: archive[key] for key in archive.files}
+    else:
+        import json
+        with open(path, encoding="utf-8") as file:
+            raw = json.load(file)
     
-    # 4. Фруктове пюре: тільки для Фруктового соку потрібно 2 од., всього доступно 40 од.
-    model += 2 * fruit_juice <= 40, "Fruit_Puree_Constraint"
+    recipes = np.asarray(raw["recipes"], dtype=float)
+    n_resources, n_products = recipes.shape
+    return {
+        "recipes": recipes,
+        "capacities": np.asarray(raw["capacities"], dtype=float),
+        "objective": np.asarray(raw.get("objective", np.ones(n_products)), dtype=float),
+        "products": [str(p) for p in raw.get("products", [f"x_{j}" for j in range(n_products)])],
+        "resources": [str(r) for r in raw.get("resources", [f"c_{i}" for i in range(n_resources)])],
+    }
+
+def extract_solution(model, variables) -> Tuple[str, np.ndarray]:
+    """
+    Отримує результати з розв'язаної моделі.
     
-    # Розв'язуємо задачу
-    model.solve()
+    Returns:
+        Tuple: (статус_розв'язання, план_виробництва)
+    """
+    import pulp
     
-    # Отримуємо результати
     status = pulp.LpStatus[model.status]
-    lemonade_qty = int(lemonade.varValue) if lemonade.varValue else 0
-    fruit_juice_qty = int(fruit_juice.varValue) if fruit_juice.varValue else 0
+    plan = np.array([variable.varValue or 0 for variable in variables], dtype=float)
+    if all(variable.cat == pulp.LpInteger for variable in variables):
+        plan = np.rint(plan).astype(np.int64)
+    
+    return status, plan
+
+def solve_model(model, solver):
+    """
+    Розв'язує модель PuLP і записує метрику task1.solve (час, статус, розмір моделі;
+    nodes=None - CBC не повідомляє кількість вузлів без журналу).
+    
+    Args:
+        model: Модель PuLP
+        solver: Розв'язувач PuLP (див. make_pulp_solver)
+    """
+    import pulp
+    
+    # CBC запускається без журналу (msg=False), тож кількість вузлів невідома
+    with metrics.timer("task1.solve", solver="cbc", nodes=None) as timing:
+        model.solve(solver)
+        timing.set(status=pulp.LpStatus[model.status], variables=model.numVariables(),
+                   constraints=model.numConstraints())
+
+SOLVERS = ("cbc", "highs")
+
+_MILP_STATUSES = {0: "Optimal", 1: "Not Solved", 2: "Infeasible", 3: "Unbounded", 4: "Undefined"}
+
+def make_pulp_solver(time_limit: Optional[float] = None, mip_gap: Optional[float] = None,
+                     threads: Optional[int] = None, warm_start: bool = False):
+    """
+    Створює розв'язувач CBC для PuLP без виводу в консоль.
+    
+    Args:
+        time_limit: Обмеження часу в секундах
+        mip_gap: Допустимий відносний розрив для цілочисельної задачі
+        threads: Кількість потоків CBC
+        warm_start: Використовувати початкові значення змінних
+    """
+    import pulp
+    
+    return pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit, gapRel=mip_gap,
+                             threads=threads, warmStart=warm_start)
+
+def _solve_highs(recipes, capacities: np.ndarray, objective: np.ndarray, cat: str,
+                 time_limit: Optional[float], mip_gap: Optional[float]) -> Tuple[str, np.ndarray]:
+    """
+    Розв'язує задачу в пам'яті через HiGHS (scipy.optimize.milp), без файлів
+    і зовнішніх процесів.
+    """
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    
+    options = {"disp": False}
+    if time_limit is not None:
+        options["time_limit"] = time_limit
+    if mip_gap is not None:
+        options["mip_rel_gap"] = mip_gap
+    
+    started = metrics.clock()
+    integrality = np.ones(len(objective)) if cat == 'Integer' else np.zeros(len(objective))
+    result = milp(-objective,
+                  constraints=LinearConstraint(recipes, -np.inf, capacities),
+                  integrality=integrality,
+                  bounds=Bounds(0, np.inf),
+                  options=options)
+    
+    status = _MILP_STATUSES.get(result.status, "Undefined")
+    metrics.record("task1.solve", started, solver="highs", status=status,
+                   variables=len(objective), constraints=len(capacities),
+                   nodes=getattr(result, "mip_node_count", None), mip_gap=getattr(result, "mip_gap", None))
+    if result.x is None:
+        return status, np.zeros(len(objective), dtype=np.int64 if cat == 'Integer' else float)
+    plan = np.rint(result.x).astype(np.int64) if cat == 'Integer' else result.x
+    return status, plan
+
+def solve_production(recipes=None, capacities=None, objective=None, cat: str = 'Integer',
+                     solver: str = "cbc", time_limit: Optional[float] = None,
+                     mip_gap: Optional[float] = None,
+                     threads: Optional[int] = None,
+                     initial_plan: Optional[np.ndarray] = None) -> Tuple[str, np.ndarray]:
+    """
+    Розв'язує задачу виробництва вибраним розв'язувачем.
+    
+    "cbc" - PuLP з CBC (модель записується у файл і розв'язується окремим процесом);
+    "highs" - HiGHS через scipy.optimize.milp у поточному процесі, дані лишаються
+    в пам'яті, що для малих і середніх задач значно швидше.
+    
+    Args:
+        recipes: Матриця (ресурси × продукти) (за замовчуванням RECIPES)
+        capacities: Запаси ресурсів (за замовчуванням CAPACITIES)
+        objective: Коефіцієнти цільової функції (за замовчуванням TOTAL_PRODUCTS)
+        cat: Тип змінних: 'Integer' або 'Continuous'
+        solver: Один з SOLVERS
+        time_limit: Обмеження часу в секундах
+        mip_gap: Допустимий відносний розрив для цілочисельної задачі
+        threads: Кількість потоків (лише CBC; scipy.optimize.milp не має цього параметра)
+        initial_plan: Початковий план для теплого старту (лише CBC; scipy.optimize.milp
+            не приймає початкового розв'язку)
+        
+    Returns:
+        Tuple: (статус_розв'язання, план_виробництва)
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Невідомий розв'язувач: {solver!r}. Допустимі: {SOLVERS}")
+    
+    recipes = RECIPES if recipes is None else recipes
+    capacities = np.asarray(CAPACITIES if capacities is None else capacities, dtype=float)
+    objective = np.asarray(TOTAL_PRODUCTS if objective is None else objective, dtype=float)
+    
+    if solver == "highs":
+        return _solve_highs(recipes, capacities, objective, cat, time_limit, mip_gap)
+    
+    model, variables, _ = build_production_model(recipes, capacities, objective, cat=cat)
+    if initial_plan is not None:
+        for variable, value in zip(variables, np.asarray(initial_plan).tolist()):
+            variable.setInitialValue(value)
+    solve_model(model, make_pulp_solver(time_limit, mip_gap, threads, warm_start=initial_plan is not None))
+    return extract_solution(model, variables)
+
+def model_keys(recipes, capacities, objective, cat: str = 'Integer',
+               mip_gap: Optional[float] = None, time_limit: Optional[float] = None) -> Tuple[str, str]:
+    """
+    Канонічні ключі моделі для кешу розв'язків.
+    
+    Матриця береться у форматі CSR з коефіцієнтами float, тому щільна й
+    розріджена форми та цілі й дробові типи однакових даних дають той самий ключ.
+    Розв'язок з допустимим розривом mip_gap або обмеженням часу time_limit може
+    бути неоптимальним, тому ці параметри входять до ключа моделі (без них ключ
+    відповідає точному розв'язку).
+    
+    Returns:
+        Tuple: (ключ_структури, ключ_моделі) - структура: матриця, цільова функція,
+            межі та тип змінних; модель: структура разом із запасами ресурсів
+    """
+    indptr, indices, data = _sparse_rows(recipes)
+    structure = make_key("production", tuple(recipes.shape),
+                         np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64),
+                         np.asarray(data, dtype=float), np.asarray(objective, dtype=float),
+                         "lower=0", cat)
+    key = make_key(structure, np.asarray(capacities, dtype=float))
+    if mip_gap or time_limit is not None:
+        key = make_key(key, "mip_gap", float(mip_gap or 0),
+                       "time_limit", None if time_limit is None else float(time_limit))
+    return structure, key
+
+_solution_cache = ResultCache()
+
+def configure_solution_cache(maxsize: int = 256, path: Optional[str] = None,
+                             maxbytes: Optional[int] = None) -> ResultCache:
+    """
+    Замінює кеш розв'язків задачі виробництва.
+    
+    Args:
+        maxsize: Максимальна кількість записів у пам'яті
+        path: Каталог для збереження розв'язків на диску (None - лише в пам'яті)
+        maxbytes: Максимальний сумарний розмір записів у пам'яті
+        
+    Returns:
+        ResultCache: Новий кеш
+    """
+    global _solution_cache
+    _solution_cache = ResultCache(maxsize=maxsize, path=path, maxbytes=maxbytes)
+    return _solution_cache
+
+def solve_production_cached(recipes=None, capacities=None, objective=None, cat: str = 'Integer',
+                            solver: str = "cbc", **solver_options) -> Tuple[str, np.ndarray, str]:
+    """
+    Розв'язує задачу виробництва з кешем розв'язків.
+    
+    Оптимальний план зберігається під ключем моделі та під ключем її структури.
+    Повторний запит тієї ж моделі повертає план з кешу; для моделі з тією ж
+    структурою, але іншими запасами, останній збережений план передається
+    розв'язувачу як початковий (теплий старт, див. solve_production; лише для
+    "cbc" - HiGHS початкового плану не приймає).
+    
+    Точний розв'язок (без mip_gap і time_limit) повертається і для запитів з
+    цими параметрами, а наближений - лише для запиту з тими самими параметрами.
+    
+    Args:
+        recipes: Матриця (ресурси × продукти) (за замовчуванням RECIPES)
+        capacities: Запаси ресурсів (за замовчуванням CAPACITIES)
+        objective: Коефіцієнти цільової функції (за замовчуванням TOTAL_PRODUCTS)
+        cat: Тип змінних: 'Integer' або 'Continuous'
+        solver: Один з SOLVERS
+        **solver_options: time_limit, mip_gap, threads
+        
+    Returns:
+        Tuple: (статус_розв'язання, план_виробництва, кеш) - кеш: "hit" (план з кешу),
+            "warm" (теплий старт з плану схожої моделі) або "miss"
+    """
+    recipes = RECIPES if recipes is None else recipes
+    capacities = np.asarray(CAPACITIES if capacities is None else capacities, dtype=float)
+    objective = np.asarray(TOTAL_PRODUCTS if objective is None else objective, dtype=float)
+    structure_key, exact_key = model_keys(recipes, capacities, objective, cat)
+    _, key = model_keys(recipes, capacities, objective, cat,
+                        mip_gap=solver_options.get("mip_gap"),
+                        time_limit=solver_options.get("time_limit"))
+    
+    for candidate in dict.fromkeys((exact_key, key)):
+        cached = _solution_cache.get(candidate)
+        if cached is not None:
+            metrics.count("task1.cache.hit")
+            metrics.event("task1.cache", state="hit", solver=solver)
+            return "Optimal", cached.copy(), "hit"
+    
+    initial_plan = _solution_cache.get(structure_key) if solver == "cbc" else None
+    status, plan = solve_production(recipes, capacities, objective, cat=cat, solver=solver,
+                                    initial_plan=initial_plan, **solver_options)
+    if status == "Optimal":
+        _solution_cache.set(key, plan)
+        _solution_cache.set(structure_key, plan)
+    state = "miss" if initial_plan is None else "warm"
+    metrics.count(f"task1.cache.{state}")
+    metrics.event("task1.cache", state=state, solver=solver, status=status)
+    return status, plan, state
+
+SOLVE_PATHS = ("lp-integral", "rounding", "mip")
+
+def _column(recipes, j: int) -> np.ndarray:
+    """
+    Стовпець j матриці рецептів як щільний масив.
+    """
+    column = recipes[:, [j]]
+    column = column.toarray() if hasattr(column, "toarray") else np.asarray(column)
+    return column.ravel().astype(float)
+
+def _repair_plan(recipes, capacities: np.ndarray, objective: np.ndarray,
+                 plan: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Евристика відновлення цілочисельного плану.
+    
+    Спершу план зменшується по одиниці, доки не виконуються всі обмеження
+    (зменшується змінна, що найбільше знижує порушення на одиницю втраченої
+    цільової функції), потім жадібно доповнюється продуктами з найбільшим
+    коефіцієнтом цільової функції в межах залишків ресурсів.
+    
+    Returns:
+        np.ndarray: Допустимий цілочисельний план або None
+    """
+    plan = np.maximum(plan, 0).astype(np.int64)
+    
+    for _ in range(int(plan.sum()) + 1):
+        violation = np.maximum(recipes @ plan - capacities, 0)
+        if not violation.any():
+            break
+        scores = (recipes.T @ violation) / np.maximum(objective, 1e-12)
+        scores[plan == 0] = -np.inf
+        j = int(np.argmax(scores))
+        if scores[j] <= 0:
+            return None
+        plan[j] -= 1
+    else:
+        return None
+    
+    slack = capacities - recipes @ plan
+    for j in np.argsort(-objective, kind="stable").tolist():
+        if objective[j] <= 0:
+            break
+        column = _column(recipes, j)
+        positive = column > 0
+        if not positive.any():
+            continue
+        step = int(np.floor(np.min(slack[positive] / column[positive]) + 1e-9))
+        if step > 0:
+            plan[j] += step
+            slack -= step * column
+    return plan
+
+def solve_production_relaxed(recipes=None, capacities=None, objective=None,
+                             solver: str = "highs", gap_tol: float = 1e-9,
+                             int_tol: float = 1e-6, **solver_options) -> Tuple[str, np.ndarray, str]:
+    """
+    Розв'язує цілочисельну задачу через LP-релаксацію з переходом до MIP лише за потреби.
+    
+    1. Розв'язується LP-релаксація; якщо її розв'язок цілочисельний (з допуском
+       int_tol), він оптимальний і для цілочисельної задачі ("lp-integral").
+    2. Інакше LP-розв'язок округлюється вниз і до найближчого цілого, а кандидати
+       відновлюються _repair_plan. Якщо розрив між найкращим з них і верхньою
+       межею LP не перевищує gap_tol (відносно), план приймається ("rounding").
+       Для цілих коефіцієнтів цільової функції межа LP округлюється вниз.
+    3. Інакше розв'язується повна цілочисельна задача ("mip").
+    
+    Args:
+        recipes: Матриця (ресурси × продукти) (за замовчуванням RECIPES)
+        capacities: Запаси ресурсів (за замовчуванням CAPACITIES)
+        objective: Коефіцієнти цільової функції (за замовчуванням TOTAL_PRODUCTS)
+        solver: Розв'язувач для LP та MIP (див. solve_production)
+        gap_tol: Допустимий відносний розрив для прийняття округленого плану
+        int_tol: Допуск перевірки цілочисельності LP-розв'язку
+        **solver_options: time_limit, mip_gap, threads
+        
+    Returns:
+        Tuple: (статус_розв'язання, план_виробництва, шлях) - шлях один з SOLVE_PATHS
+    """
+    recipes = RECIPES if recipes is None else recipes
+    capacities = np.asarray(CAPACITIES if capacities is None else capacities, dtype=float)
+    objective = np.asarray(TOTAL_PRODUCTS if objective is None else objective, dtype=float)
+    
+    status, relaxed = solve_production(recipes, capacities, objective, cat='Continuous',
+                                       solver=solver, **solver_options)
+    if status == "Optimal":
+        rounded = np.rint(relaxed)
+        if np.all(np.abs(relaxed - rounded) <= int_tol):
+            metrics.count("task1.path.lp-integral")
+            metrics.event("task1.path", path="lp-integral", solver=solver)
+            return status, rounded.astype(np.int64), "lp-integral"
+        
+        bound = float(objective @ relaxed)
+        if np.array_equal(objective, np.rint(objective)):
+            bound = np.floor(bound + int_tol)
+        
+        candidates = [_repair_plan(recipes, capacities, objective, np.floor(relaxed + int_tol)),
+                      _repair_plan(recipes, capacities, objective, rounded)]
+        candidates = [plan for plan in candidates if plan is not None]
+        if candidates:
+            best = max(candidates, key=lambda plan: float(objective @ plan))
+            if bound - float(objective @ best) <= gap_tol * max(1.0, abs(bound)):
+                metrics.count("task1.path.rounding")
+                metrics.event("task1.path", path="rounding", solver=solver)
+                return status, best, "rounding"
+    
+    status, plan = solve_production(recipes, capacities, objective, solver=solver, **solver_options)
+    metrics.count("task1.path.mip")
+    metrics.event("task1.path", path="mip", solver=solver, status=status)
+    return status, plan, "mip"
+
+def solve_production_optimization(solver: str = "cbc", **solver_options):
+    """
+    Розв'язує задачу оптимізації виробництва напоїв.
+    
+    Args:
+        solver: Розв'язувач: "cbc" або "highs" (див. solve_production)
+        **solver_options: time_limit, mip_gap, threads
+    
+    Returns:
+        Tuple: (статус_розв'язання, кількість_лимонаду, кількість_фруктового_соку, загальна_кількість,
+            модель PuLP або None для "highs")
+    """
+    model = None
+    if solver == "cbc":
+        model, variables, _ = build_production_model()
+        
+        # Розв'язуємо задачу
+        solve_model(model, make_pulp_solver(**solver_options))
+        
+        # Отримуємо результати
+        status, plan = extract_solution(model, variables)
+    else:
+        status, plan = solve_production(solver=solver, **solver_options)
+    
+    lemonade_qty, fruit_juice_qty = int(plan[0]), int(plan[1])
     total_products = lemonade_qty + fruit_juice_qty
     
     return status, lemonade_qty, fruit_juice_qty, total_products, model
 
+def analyze_resource_usage_batch(plans, recipes=None, capacities=None, tol: float = 0.0) -> Dict:
+    """
+    Аналізує використання ресурсів для багатьох планів одним множенням матриць.
+    
+    Args:
+        plans: Масив планів (кількість_планів × продукти) або один план (продукти,)
+        recipes: Матриця (ресурси × продукти), щільна або розріджена (за замовчуванням RECIPES)
+        capacities: Запаси ресурсів (за замовчуванням CAPACITIES)
+        tol: Допуск, з яким ресурс вважається вичерпаним (limiting позначає також
+            перевищені запаси)
+        
+    Returns:
+        Dict: Масиви used, slack, utilisation, limiting (кількість_планів × ресурси),
+            available (ресурси,) та feasible (кількість_планів,)
+    """
+    recipes = RECIPES if recipes is None else recipes
+    available = np.asarray(CAPACITIES if capacities is None else capacities)
+    plans = np.atleast_2d(np.asarray(plans))
+    
+    used = np.asarray(recipes @ plans.T).T
+    slack = available - used
+    utilisation = np.divide(used, available, out=np.full(used.shape, np.nan),
+                            where=available != 0)
+    limiting = slack <= tol
+    return {
+        "used": used,
+        "available": available,
+        "slack": slack,
+        "utilisation": utilisation,
+        "limiting": limiting,
+        "feasible": np.all(slack >= -tol, axis=1),
+    }
+
 def analyze_resource_usage(lemonade_qty: int, fruit_juice_qty: int):
     """
     Аналізує використання ресурсів при заданому виробництві.
@@ -66,28 +553,18 @@ def analyze_resource_usage(lemonade_qty: int, fruit_juice_qty: int):
         Dict: Інформація про використання ресурсів
     """
     
-    # Розрахунок використання ресурсів
+    # Розрахунок використання ресурсів (рядок результату пакетного аналізу)
+    usage = analyze_resource_usage_batch([lemonade_qty, fruit_juice_qty])
+    used = usage["used"][0].tolist()
+    available = usage["available"].tolist()
+    slack = usage["slack"][0].tolist()
     resources = {
-        "Вода": {
-            "використано": 2 * lemonade_qty + 1 * fruit_juice_qty,
-            "доступно": 100,
-            "залишок": 100 - (2 * lemonade_qty + 1 * fruit_juice_qty)
-        },
-        "Цукор": {
-            "використано": 1 * lemonade_qty,
-            "доступно": 50,
-            "залишок": 50 - (1 * lemonade_qty)
-        },
-        "Лимонний сік": {
-            "використано": 1 * lemonade_qty,
-            "доступно": 30,
-            "залишок": 30 - (1 * lemonade_qty)
-        },
-        "Фруктове пюре": {
-            "використано": 2 * fruit_juice_qty,
-            "доступно": 40,
-            "залишок": 40 - (2 * fruit_juice_qty)
+        name: {
+            "використано": used[i],
+            "доступно": available[i],
+            "залишок": slack[i]
         }
+        for i, name in enumerate(RESOURCES)
     }
     
     return resources
@@ -130,56 +607,475 @@ def display_results(status: str, lemonade_qty: int, fruit_juice_qty: int,
     else:
         print(f"❌ Не вдалося знайти оптимальне рішення. Статус: {status}")
 
-def sensitivity_analysis():
+def _select_basis(full_matrix: np.ndarray, values: np.ndarray, reduced_costs: np.ndarray,
+                  value_tol: float, cost_tol: float) -> np.ndarray:
     """
-    Проводить аналіз чутливості - як зміна ресурсів впливає на результат.
+    Відновлює оптимальний базис симплекс-методу з розв'язку LP та двоїстих оцінок розв'язувача.
+    
+    Кандидати в базис - стовпці [A | I] з нульовою приведеною вартістю (за
+    двоїстими оцінками розв'язувача), спершу ті, що мають додатне значення.
+    Базис з таких стовпців дає ті самі тіньові ціни, що й розв'язувач, навіть
+    у виродженій вершині. Серед кандидатів вибираються лінійно незалежні стовпці.
     """
-    print(f"\n🔍 АНАЛІЗ ЧУТЛИВОСТІ")
-    print("=" * 40)
+    from scipy.linalg import qr
+    
+    m = full_matrix.shape[0]
+    candidates = np.flatnonzero(np.abs(reduced_costs) <= cost_tol)
+    order = np.argsort(values[candidates] <= value_tol, kind="stable")
+    candidates = candidates[order]
     
-    base_status, base_lemonade, base_fruit_juice, base_total, _ = solve_production_optimization()
+    # Жадібний вибір незалежних стовпців у порядку пріоритету
+    basis = []
+    for column in candidates.tolist():
+        trial = full_matrix[:, basis + [column]]
+        if np.linalg.matrix_rank(trial, tol=1e-10 * max(1.0, np.abs(trial).max())) == len(basis) + 1:
+            basis.append(column)
+            if len(basis) == m:
+                break
     
-    print(f"Базове рішення: {base_lemonade} лимонаду + {base_fruit_juice} фруктового соку = {base_total} всього")
+    # Запасний варіант (не мав би знадобитися): доповнення стовпцями залишків
+    if len(basis) < m:
+        _, _, row_pivots = qr(full_matrix[:, basis].T, mode="economic", pivoting=True) if basis \
+            else (None, None, np.arange(m))
+        covered = row_pivots[:len(basis)]
+        n_structural = full_matrix.shape[1] - m
+        basis += [n_structural + i for i in np.setdiff1d(np.arange(m), covered).tolist()]
+    return np.sort(np.array(basis, dtype=np.int64))
+
+def lp_sensitivity(recipes=None, capacities=None, objective=None,
+                   product_names: Optional[List[str]] = None,
+                   resource_names: Optional[List[str]] = None,
+                   tol: float = 1e-7) -> Dict:
+    """
+    Аналіз чутливості за одним розв'язком LP-релаксації.
     
-    # Тестуємо збільшення кожного ресурсу на 10%
-    scenarios = [
-        ("Вода +10%", {"water": 110}),
-        ("Цукор +10%", {"sugar": 55}),
-        ("Лимонний сік +10%", {"lemon": 33}),
-        ("Фруктове пюре +10%", {"puree": 44})
-    ]
+    Для кожного ресурсу - тіньова ціна (приріст цільової функції на одиницю
+    ресурсу), залишок та діапазон запасу, в якому тіньова ціна незмінна.
+    Для кожного продукту - значення, приведена вартість та діапазон коефіцієнта
+    цільової функції, в якому оптимальний план не змінюється.
     
-    print(f"\nВплив збільшення ресурсів на 10%:")
+    LP розв'язується HiGHS (scipy.optimize.linprog) у поточному процесі: тіньові
+    ціни та приведені вартості беруться з двоїстих оцінок розв'язувача, а базис
+    для діапазонів будується узгоджено з ними (див. _select_basis).
     
-    for scenario_name, changes in scenarios:
-        # Створюємо нову модель з модифікованими ресурсами
-        model = pulp.LpProblem("Sensitivity_Test", pulp.LpMaximize)
+    Args:
+        recipes: Матриця (ресурси × продукти) (за замовчуванням RECIPES)
+        capacities: Запаси ресурсів (за замовчуванням CAPACITIES)
+        objective: Коефіцієнти цільової функції (за замовчуванням TOTAL_PRODUCTS)
+        product_names: Назви продуктів (за замовчуванням PRODUCTS або x_j)
+        resource_names: Назви ресурсів (за замовчуванням RESOURCES або c_i)
+        tol: Відносний допуск для порівнянь з нулем (масштабується за даними задачі)
         
-        lemonade = pulp.LpVariable("Lemonade", lowBound=0, cat='Integer')
-        fruit_juice = pulp.LpVariable("Fruit_Juice", lowBound=0, cat='Integer')
+    Returns:
+        Dict: status, objective, resources {назва: shadow_price, slack, rhs_range},
+            products {назва: value, reduced_cost, objective_range}
+    """
+    from scipy.optimize import linprog
+    
+    recipes = RECIPES if recipes is None else recipes
+    capacities = np.asarray(CAPACITIES if capacities is None else capacities, dtype=float)
+    objective = np.asarray(TOTAL_PRODUCTS if objective is None else objective, dtype=float)
+    dense = recipes.toarray() if hasattr(recipes, "toarray") else np.asarray(recipes, dtype=float)
+    m, n = dense.shape
+    
+    if product_names is None:
+        product_names = PRODUCTS if n == len(PRODUCTS) else [f"x_{j}" for j in range(n)]
+    if resource_names is None:
+        resource_names = RESOURCES if m == len(RESOURCES) else [f"c_{i}" for i in range(m)]
+    
+    started = metrics.clock()
+    result = linprog(-objective, A_ub=dense, b_ub=capacities, bounds=(0, None), method="highs")
+    status = _MILP_STATUSES.get(result.status, "Undefined")
+    metrics.record("task1.solve", started, solver="highs-lp", status=status, variables=n, constraints=m)
+    if status != "Optimal":
+        return {"status": status}
+    
+    # Допуски у масштабі даних задачі
+    value_tol = tol * max(1.0, float(np.abs(capacities).max(initial=0.0)))
+    cost_tol = tol * max(1.0, float(np.abs(objective).max(initial=0.0)))
+    
+    # Стандартна форма: [A | I] [x; s] = b, x, s >= 0
+    plan = result.x
+    slack = result.ineqlin.residual
+    full_matrix = np.hstack((dense, np.eye(m)))
+    full_costs = np.concatenate((objective, np.zeros(m)))
+    values = np.concatenate((plan, slack))
+    
+    # Двоїсті оцінки розв'язувача (задача мінімізації -c: маргінали <= 0)
+    solver_prices = -result.ineqlin.marginals
+    solver_reduced = full_costs - solver_prices @ full_matrix
+    
+    basis = _select_basis(full_matrix, values, solver_reduced, value_tol, cost_tol)
+    basis_inverse = np.linalg.inv(full_matrix[:, basis])
+    basic_values = np.maximum(basis_inverse @ capacities, 0.0)
+    
+    # Тіньові ціни та приведені вартості (для максимізації d_j <= 0 поза базисом)
+    shadow_prices = full_costs[basis] @ basis_inverse
+    reduced_costs = full_costs - shadow_prices @ full_matrix
+    reduced_costs[basis] = 0.0
+    
+    def ratio_range(direction: np.ndarray, base: np.ndarray, limit: float) -> Tuple[float, float]:
+        # Найбільший інтервал δ, для якого base + δ·direction >= 0
+        lower, upper = -np.inf, np.inf
+        positive, negative = direction > limit, direction < -limit
+        if positive.any():
+            lower = float(np.max(-base[positive] / direction[positive]))
+        if negative.any():
+            upper = float(np.min(-base[negative] / direction[negative]))
+        # Некоректний (обернений) інтервал означає вироджений випадок - лише δ = 0
+        if lower > upper:
+            lower = upper = 0.0
+        return min(lower, 0.0), max(upper, 0.0)
+    
+    resources = {}
+    for i, name in enumerate(resource_names):
+        lower, upper = ratio_range(basis_inverse[:, i], basic_values, 1e-12)
+        resources[name] = {
+            "shadow_price": float(shadow_prices[i]),
+            "slack": float(slack[i]),
+            "rhs_range": (float(capacities[i] + lower), float(capacities[i] + upper)),
+        }
+    
+    nonbasic = np.setdiff1d(np.arange(n + m), basis)
+    position = {column: k for k, column in enumerate(basis.tolist())}
+    tableau_rows = basis_inverse @ full_matrix[:, nonbasic]
+    
+    products = {}
+    for j, name in enumerate(product_names):
+        if j in position:
+            # Коефіцієнт базисної змінної: усі приведені вартості мають лишитися <= 0
+            lower, upper = ratio_range(tableau_rows[position[j]], np.maximum(-reduced_costs[nonbasic], 0.0),
+                                       1e-12)
+            objective_range = (float(objective[j] + lower), float(objective[j] + upper))
+        else:
+            objective_range = (-np.inf, float(objective[j] - reduced_costs[j]))
+        products[name] = {
+            "value": float(plan[j]),
+            "reduced_cost": float(reduced_costs[j]),
+            "objective_range": objective_range,
+        }
+    
+    return {
+        "status": status,
+        "objective": float(objective @ plan),
+        "resources": resources,
+        "products": products,
+    }
+
+def _scenario_capacities(spec, base: np.ndarray, resource_names: List[str]) -> np.ndarray:
+    """
+    Повний вектор запасів сценарію: масив або словник {назва_чи_індекс: запас}.
+    """
+    if spec is None:
+        return base
+    if isinstance(spec, dict):
+        capacities = base.copy()
+        for key, value in spec.items():
+            capacities[resource_names.index(key) if isinstance(key, str) else key] = value
+        return capacities
+    return np.asarray(spec, dtype=float)
+
+def _sweep_worker(recipes, capacities: np.ndarray, objective: np.ndarray, cat: str,
+                  scenarios: List[Dict], resource_names: List[str],
+                  warm_start: bool, solver: str = "cbc",
+                  solver_options: Optional[Dict] = None) -> List[Tuple[str, float, np.ndarray]]:
+    """
+    Розв'язує групу сценаріїв на одній моделі, змінюючи лише праві частини
+    обмежень і цільову функцію; попередній план передається як початковий.
+    Для "highs" модель не потрібна: кожен сценарій розв'язується напряму з масивів.
+    """
+    import pulp
+    
+    solver_options = solver_options or {}
+    if solver == "highs":
+        results = []
+        for scenario in scenarios:
+            scenario_capacities = _scenario_capacities(scenario.get("capacities"), capacities, resource_names)
+            scenario_objective = np.asarray(scenario.get("objective", objective), dtype=float)
+            status, plan = solve_production(recipes, scenario_capacities, scenario_objective,
+                                            cat=cat, solver="highs", **solver_options)
+            results.append((status, float(scenario_objective @ plan), plan))
+        return results
+    
+    model, variables, constraints = build_production_model(recipes, capacities, objective,
+                                                           cat=cat, name="Scenario_Sweep")
+    solver = make_pulp_solver(warm_start=warm_start, **solver_options)
+    current_objective = objective
+    results = []
+    
+    for scenario in scenarios:
+        scenario_capacities = _scenario_capacities(scenario.get("capacities"), capacities, resource_names)
+        for constraint, rhs in zip(constraints, scenario_capacities.tolist()):
+            constraint.changeRHS(rhs)
         
-        model += lemonade + fruit_juice, "Total_Products"
+        scenario_objective = np.asarray(scenario.get("objective", objective), dtype=float)
+        if not np.array_equal(scenario_objective, current_objective):
+            model.setObjective(pulp.LpAffineExpression(
+                [(variables[j], scenario_objective[j]) for j in np.flatnonzero(scenario_objective).tolist()]))
+            current_objective = scenario_objective
         
-        # Застосовуємо базові або модифіковані обмеження
-        water_limit = changes.get("water", 100)
-        sugar_limit = changes.get("sugar", 50)
-        lemon_limit = changes.get("lemon", 30)
-        puree_limit = changes.get("puree", 40)
+        solve_model(model, solver)
+        status, plan = extract_solution(model, variables)
+        results.append((status, float(scenario_objective @ plan), plan))
         
-        model += 2 * lemonade + 1 * fruit_juice <= water_limit, "Water"
-        model += 1 * lemonade <= sugar_limit, "Sugar"
-        model += 1 * lemonade <= lemon_limit, "Lemon"
-        model += 2 * fruit_juice <= puree_limit, "Puree"
+        # Розв'язок поточного сценарію - початкова точка для наступного
+        if warm_start and status == "Optimal":
+            for variable, value in zip(variables, plan.tolist()):
+                variable.setInitialValue(value)
+    
+    return results
+
+def scenario_sweep(scenarios: List[Dict], recipes=None, capacities=None, objective=None,
+                   cat: str = 'Integer', workers: int = 1, warm_start: bool = True,
+                   resource_names: Optional[List[str]] = None, tol: float = 1e-9,
+                   solver: str = "cbc", **solver_options) -> Dict:
+    """
+    Розв'язує набір сценаріїв «що, якщо» для запасів ресурсів і цін.
+    
+    Модель будується один раз на процес; між сценаріями змінюються лише праві
+    частини обмежень і коефіцієнти цільової функції, а попередній розв'язок
+    використовується як початковий (warm start CBC). Сценарії діляться між
+    workers процесами послідовними групами.
+    
+    Args:
+        scenarios: Список словників з необов'язковими ключами name, capacities
+            (масив або {назва_чи_індекс_ресурсу: запас}) та objective (масив)
+        recipes: Матриця (ресурси × продукти) (за замовчуванням RECIPES)
+        capacities: Базові запаси (за замовчуванням CAPACITIES)
+        objective: Базова цільова функція (за замовчуванням TOTAL_PRODUCTS)
+        cat: Тип змінних: 'Integer' або 'Continuous'
+        workers: Кількість процесів
+        warm_start: Передавати попередній розв'язок як початковий
+        resource_names: Назви ресурсів (за замовчуванням RESOURCES або c_i)
+        tol: Допуск, з яким обмеження вважається активним
+        solver: Розв'язувач: "cbc" або "highs" (див. solve_production)
+        **solver_options: time_limit, mip_gap, threads
         
-        model.solve()
+    Returns:
+        Dict: Таблиця за стовпцями: scenario, status, objective (масив),
+            plan (масив сценарії × продукти), binding (кортежі активних ресурсів)
+    """
+    recipes = RECIPES if recipes is None else recipes
+    capacities = np.asarray(CAPACITIES if capacities is None else capacities, dtype=float)
+    objective = np.asarray(TOTAL_PRODUCTS if objective is None else objective, dtype=float)
+    n_resources, n_products = recipes.shape
+    if resource_names is None:
+        resource_names = RESOURCES if n_resources == len(RESOURCES) else [f"c_{i}" for i in range(n_resources)]
+    
+    # Послідовні групи сценаріїв, щоб warm start працював усередині групи
+    workers = max(1, min(workers, len(scenarios)))
+    bounds = np.linspace(0, len(scenarios), workers + 1).astype(int)
+    tasks = [(recipes, capacities, objective, cat, scenarios[start:stop], resource_names, warm_start,
+              solver, solver_options)
+             for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+    results = [row for group in run_workers(_sweep_worker, tasks, workers) for row in group]
+    
+    plans = np.array([plan for _, _, plan in results]).reshape(len(results), n_products)
+    all_capacities = np.array([_scenario_capacities(scenario.get("capacities"), capacities, resource_names)
+                               for scenario in scenarios]).reshape(len(scenarios), n_resources)
+    used = plans @ (recipes.T.toarray() if hasattr(recipes, "toarray") else np.asarray(recipes).T)
+    binding_mask = all_capacities - used <= tol
+    
+    return {
+        "scenario": [scenario.get("name", str(k)) for k, scenario in enumerate(scenarios)],
+        "status": [status for status, _, _ in results],
+        "objective": np.array([value for _, value, _ in results]),
+        "plan": plans,
+        "binding": [tuple(name for name, flag in zip(resource_names, row) if flag) for row in binding_mask],
+    }
+
+# Критерії Парето-фронту: коефіцієнти та напрям оптимізації
+PARETO_OBJECTIVES = {
+    "Обсяг": (TOTAL_PRODUCTS, "max"),
+    "Прибуток": (PROFIT, "max"),
+    "Витрата ресурсів": (RECIPES.sum(axis=0), "min"),
+}
+
+def _simplex_weights(n_objectives: int, steps: int) -> np.ndarray:
+    """
+    Рівномірна сітка ваг на симплексі: усі вектори з кроком 1/steps і сумою 1.
+    """
+    import itertools
+    
+    grid = [combo for combo in itertools.product(range(steps + 1), repeat=n_objectives)
+            if sum(combo) == steps]
+    return np.array(grid, dtype=float) / steps
+
+def _nondominated(values: np.ndarray) -> np.ndarray:
+    """
+    Маска недомінованих точок (усі критерії максимізуються).
+    """
+    no_worse = np.all(values[:, None, :] >= values[None, :, :], axis=2)
+    better = np.any(values[:, None, :] > values[None, :, :], axis=2)
+    dominated = np.any(no_worse & better, axis=0)
+    return ~dominated
+
+PARETO_METHODS = ("epsilon", "weighted")
+
+def _append_rows(recipes, rows: np.ndarray):
+    """
+    Матриця рецептів з дописаними знизу рядками rows (щільна або розріджена).
+    """
+    if hasattr(recipes, "tocsr"):
+        from scipy import sparse
+        return sparse.vstack([recipes, sparse.csr_matrix(rows)]).tocsr()
+    return np.vstack([np.asarray(recipes, dtype=float), rows])
+
+def pareto_frontier(objectives: Optional[Dict] = None, recipes=None, capacities=None,
+                    steps: int = 10, cat: str = 'Integer', workers: int = 1,
+                    method: str = "epsilon", primary: Optional[str] = None,
+                    solver: str = "cbc", **solver_options) -> Dict:
+    """
+    Обчислює Парето-фронт для кількох критеріїв.
+    
+    Методи:
+        "epsilon" - метод ε-обмежень: критерій primary оптимізується, а кожен
+            інший стає обмеженням (не гірше за ε), дописаним до моделі рядком.
+            Пороги ε пробігають сітку з steps кроків між крайніми значеннями
+            критерію в таблиці виграшів (кожен критерій оптимізовано окремо).
+            Знаходить і точки всередині фронту, а не лише вершини множини планів.
+        "weighted" - метод зважених сум на сітці ваг симплексу; критерії
+            нормуються за довжиною вектора коефіцієнтів. Для лінійних критеріїв
+            знаходить лише вершини (опорні точки на опуклій оболонці фронту).
+    
+    Усі розв'язання - сценарії scenario_sweep на одній моделі (на кожен процес),
+    у якій змінюються лише праві частини обмежень або цільова функція.
+    Однакові плани об'єднуються, доміновані відкидаються.
+    
+    Args:
+        objectives: Словник {назва: (коефіцієнти, "max" або "min")}
+            (за замовчуванням PARETO_OBJECTIVES)
+        recipes: Матриця (ресурси × продукти) (за замовчуванням RECIPES)
+        capacities: Запаси ресурсів (за замовчуванням CAPACITIES)
+        steps: Кількість кроків сітки порогів (або ваг) за кожним критерієм
+        cat: Тип змінних: 'Integer' або 'Continuous'
+        workers: Кількість процесів
+        method: Один з PARETO_METHODS
+        primary: Критерій, що оптимізується в методі "epsilon" (за замовчуванням перший)
+        solver: Розв'язувач: "cbc" або "highs"
+        **solver_options: time_limit, mip_gap, threads
         
-        if model.status == 1:  # Optimal
-            new_lemonade = int(lemonade.varValue) if lemonade.varValue else 0
-            new_fruit_juice = int(fruit_juice.varValue) if fruit_juice.varValue else 0
-            new_total = new_lemonade + new_fruit_juice
-            improvement = new_total - base_total
-            
-            print(f"   {scenario_name}: {new_total} всього (зміна: {improvement:+d})")
+    Returns:
+        Dict: objectives (назви), plan (точки × продукти), values (точки × критерії,
+            у природних одиницях), parameters (ваги для "weighted" або пороги ε
+            для "epsilon", NaN для primary, що дали кожну точку) та solves
+            (кількість розв'язань)
+    """
+    if method not in PARETO_METHODS:
+        raise ValueError(f"Невідомий метод: {method!r}. Допустимі: {PARETO_METHODS}")
+    recipes = RECIPES if recipes is None else recipes
+    capacities = np.asarray(CAPACITIES if capacities is None else capacities, dtype=float)
+    objectives = PARETO_OBJECTIVES if objectives is None else objectives
+    names = list(objectives)
+    coefficients = np.array([np.asarray(objectives[name][0], dtype=float) for name in names])
+    signs = np.array([1.0 if objectives[name][1] == "max" else -1.0 for name in names])
+    
+    # Усі критерії у формі максимізації
+    oriented = coefficients * signs[:, None]
+    
+    if method == "weighted":
+        scale = np.linalg.norm(oriented, axis=1)
+        normalized = oriented / np.where(scale > 0, scale, 1.0)[:, None]
+        parameters = _simplex_weights(len(names), steps)
+        scenarios = [{"objective": w @ normalized} for w in parameters]
+        sweep = scenario_sweep(scenarios, recipes, capacities, objective=scenarios[0]["objective"],
+                               cat=cat, workers=workers, solver=solver, **solver_options)
+        solves = len(scenarios)
+    else:
+        import itertools
+        
+        main = names.index(names[0] if primary is None else primary)
+        others = [k for k in range(len(names)) if k != main]
+        
+        # Таблиця виграшів: межі кожного критерію-обмеження
+        payoff = scenario_sweep([{"objective": row} for row in oriented], recipes, capacities,
+                                objective=oriented[0], cat=cat, workers=workers, solver=solver,
+                                **solver_options)
+        solved = np.array([status == "Optimal" for status in payoff["status"]], dtype=bool)
+        if not solved.any():
+            raise ValueError(f"Задача не має оптимального розв'язку. Статус: {payoff['status'][0]}")
+        table = payoff["plan"][solved] @ oriented[others].T
+        grids = [np.linspace(low, high, steps + 1) for low, high in zip(table.min(axis=0), table.max(axis=0))]
+        
+        # Обмеження oriented_k @ x >= t_k у формі -oriented_k @ x <= -t_k
+        extended = _append_rows(recipes, -oriented[others])
+        thresholds = np.array(list(itertools.product(*grids))).reshape(-1, len(others))
+        scenarios = [{"capacities": np.concatenate([capacities, -t])} for t in thresholds]
+        sweep = scenario_sweep(scenarios, extended, np.concatenate([capacities, -thresholds[0]]),
+                               objective=oriented[main], cat=cat, workers=workers, solver=solver,
+                               **solver_options)
+        solves = len(oriented) + len(scenarios)
+        parameters = np.full((len(thresholds), len(names)), np.nan)
+        parameters[:, others] = thresholds * signs[others] + 0.0  # без -0.0
+    
+    solved = np.array([status == "Optimal" for status in sweep["status"]], dtype=bool)
+    if not solved.any():
+        return {"objectives": names, "plan": np.empty((0, recipes.shape[1])),
+                "values": np.empty((0, len(names))), "parameters": np.empty((0, len(names))),
+                "solves": solves}
+    
+    plans, first = np.unique(sweep["plan"][solved], axis=0, return_index=True)
+    keep = _nondominated(plans @ oriented.T)
+    plans = plans[keep]
+    order = np.lexsort((plans @ coefficients.T).T[::-1])
+    
+    return {
+        "objectives": names,
+        "plan": plans[order],
+        "values": (plans @ coefficients.T)[order],
+        "parameters": parameters[solved][first][keep][order],
+        "solves": solves,
+    }
+
+def sensitivity_analysis(increase: float = 0.1, confirm: Optional[List[str]] = None) -> Dict:
+    """
+    Проводить аналіз чутливості - як зміна ресурсів впливає на результат.
+    
+    Прогноз будується з одного розв'язку LP-релаксації (тіньові ціни та
+    діапазони запасів). Цілочисельна задача розв'язується повторно лише для
+    ресурсів, перелічених у confirm.
+    
+    Args:
+        increase: Відносне збільшення запасу ресурсу (0.1 = +10%)
+        confirm: Назви ресурсів, для яких прогноз перевіряється цілочисельним розв'язком
+        
+    Returns:
+        Dict: Результат lp_sensitivity
+    """
+    print(f"\n🔍 АНАЛІЗ ЧУТЛИВОСТІ")
+    print("=" * 40)
+    
+    report = lp_sensitivity()
+    if report["status"] != "Optimal":
+        print(f"❌ LP-релаксація не має оптимального розв'язку. Статус: {report['status']}")
+        return report
+    
+    print(f"LP-релаксація: цільова функція = {report['objective']:g}")
+    print(f"\nТіньові ціни та вплив збільшення ресурсів на {increase:.0%}:")
+    
+    for index, (resource, data) in enumerate(report["resources"].items()):
+        delta = CAPACITIES[index] * increase
+        lower, upper = data["rhs_range"]
+        prediction = data["shadow_price"] * delta
+        note = "" if CAPACITIES[index] + delta <= upper + 1e-9 else " (поза діапазоном, оцінка зверху)"
+        print(f"   {resource}: тіньова ціна {data['shadow_price']:g}, залишок {data['slack']:g}, "
+              f"діапазон [{lower:g}, {upper:g}]")
+        print(f"      +{increase:.0%}: прогноз зміни {prediction:+g}{note}")
+    
+    if confirm:
+        print(f"\nПеревірка цілочисельним розв'язком:")
+        scenarios = [{"name": "Базовий"}] + [
+            {"name": f"{resource} +{increase:.0%}",
+             "capacities": {resource: CAPACITIES[index] * (1 + increase)}}
+            for index, resource in enumerate(RESOURCES) if resource in confirm
+        ]
+        table = scenario_sweep(scenarios)
+        base_total = table["objective"][0]
+        for name, status, total in zip(table["scenario"][1:], table["status"][1:], table["objective"][1:]):
+            if status == "Optimal":
+                print(f"   {name}: {total:g} всього (зміна: {total - base_total:+g})")
+    
+    return report
 
 def alternative_objective_functions():
     """
@@ -191,28 +1087,23 @@ def alternative_objective_functions():
     # Сценарій 1: Максимізувати прибуток (припустимо різну рентабельність)
     print("1. Максимізація прибутку (Лимонад: 3 грн, Фруктовий сік: 2 грн за одиницю):")
     
-    model = pulp.LpProblem("Profit_Maximization", pulp.LpMaximize)
-    lemonade = pulp.LpVariable("Lemonade", lowBound=0, cat='Integer')
-    fruit_juice = pulp.LpVariable("Fruit_Juice", lowBound=0, cat='Integer')
-    
-    # Цільова функція: максимізувати прибуток
-    model += 3 * lemonade + 2 * fruit_juice, "Total_Profit"
-    
-    # Ті ж обмеження
-    model += 2 * lemonade + 1 * fruit_juice <= 100, "Water"
-    model += 1 * lemonade <= 50, "Sugar"
-    model += 1 * lemonade <= 30, "Lemon"
-    model += 2 * fruit_juice <= 40, "Puree"
-    
-    model.solve()
+    # Ті ж обмеження, але цільова функція - прибуток
+    status, plan = solve_production(objective=PROFIT)
     
-    if model.status == 1:
-        profit_lemonade = int(lemonade.varValue) if lemonade.varValue else 0
-        profit_fruit_juice = int(fruit_juice.varValue) if fruit_juice.varValue else 0
-        total_profit = 3 * profit_lemonade + 2 * profit_fruit_juice
+    if status == "Optimal":
+        profit_lemonade, profit_fruit_juice = int(plan[0]), int(plan[1])
+        total_profit = int(PROFIT @ plan)
         
         print(f"   Оптимальне рішення: {profit_lemonade} лимонаду + {profit_fruit_juice} фруктового соку")
         print(f"   Загальний прибуток: {total_profit} грн")
+    
+    # Сценарій 2: Компроміс між обсягом, прибутком і витратою ресурсів
+    print("\n2. Парето-фронт (обсяг, прибуток, витрата ресурсів):")
+    # Метод ε-обмежень: сітка 6 × 6 порогів прибутку та витрати ресурсів, HiGHS у процесі
+    frontier = pareto_frontier(steps=5, solver="highs")
+    for plan, values in zip(frontier["plan"], frontier["values"]):
+        criteria = ", ".join(f"{name}: {value:g}" for name, value in zip(frontier["objectives"], values))
+        print(f"   {int(plan[0])} лимонаду + {int(plan[1])} фруктового соку -> {criteria}")
 
 def main():
     """
@@ -264,5 +1155,96 @@ def main():
         'resources': resources
     }
 
+def compute_results(data_path: Optional[str] = None, solver: str = "cbc", relaxed: bool = False,
+                    cache_path: Optional[str] = None) -> Dict:
+    """
+    Розв'язує задачу оптимізації без друку.
+    
+    Args:
+        data_path: Файл з даними задачі (див. load_production_data);
+            None - задача про напої
+        solver: Розв'язувач: "cbc" або "highs"
+        relaxed: Розв'язувати через LP-релаксацію (див. solve_production_relaxed);
+            результат містить шлях, яким отримано план
+        cache_path: Каталог кешу розв'язків для задачі з файлу (див. solve_production_cached);
+            результат містить стан кешу
+    
+    Returns:
+        Dict: Результати у форматі, придатному для JSON
+    """
+    if data_path is not None:
+        data = load_production_data(data_path)
+        if relaxed:
+            status, plan, path = solve_production_relaxed(data["recipes"], data["capacities"],
+                                                          data["objective"], solver=solver)
+        elif cache_path is not None:
+            configure_solution_cache(path=cache_path)
+            status, plan, cached = solve_production_cached(data["recipes"], data["capacities"],
+                                                           data["objective"], solver=solver)
+        else:
+            status, plan = solve_production(data["recipes"], data["capacities"], data["objective"],
+                                            solver=solver)
+        results = {
+            'status': status,
+            'plan': dict(zip(data["products"], plan.tolist())),
+            'objective': float(data["objective"] @ plan)
+        }
+        if cache_path is not None and not relaxed:
+            results['cache'] = cached
+    elif relaxed:
+        status, plan, path = solve_production_relaxed(solver=solver)
+        lemonade_qty, fruit_juice_qty = int(plan[0]), int(plan[1])
+        results = {
+            'status': status,
+            'lemonade': lemonade_qty,
+            'fruit_juice': fruit_juice_qty,
+            'total': lemonade_qty + fruit_juice_qty,
+            'resources': analyze_resource_usage(lemonade_qty, fruit_juice_qty)
+        }
+    else:
+        status, lemonade_qty, fruit_juice_qty, total_products, _ = solve_production_optimization(solver)
+        return {
+            'status': status,
+            'lemonade': lemonade_qty,
+            'fruit_juice': fruit_juice_qty,
+            'total': total_products,
+            'resources': analyze_resource_usage(lemonade_qty, fruit_juice_qty)
+        }
+    
+    if relaxed:
+        results['path'] = path
+    return results
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входу командного рядка. З --json друкує результати у форматі JSON;
+    без нього запускає повну демонстрацію main().
+    """
+    import argparse
+    import json
+    import sys
+    
+    parser = argparse.ArgumentParser(description="Оптимізація виробництва напоїв (PuLP)")
+    parser.add_argument("--json", action="store_true", help="надрукувати результати у форматі JSON")
+    parser.add_argument("--data", help="файл .npz/.json з матрицею рецептів, запасами та цільовою функцією")
+    parser.add_argument("--solver", choices=SOLVERS, default="cbc", help="розв'язувач")
+    parser.add_argument("--relaxed", action="store_true",
+                        help="спершу LP-релаксація з округленням, цілочисельна задача лише за потреби")
+    parser.add_argument("--cache", metavar="DIR", help="каталог кешу розв'язків (разом з --data)")
+    parser.add_argument("--metrics", metavar="FILE", help="записати метрики виконання у файл JSON")
+    args = parser.parse_args(argv)
+    
+    if args.metrics:
+        metrics.enable()
+    
+    if not args.json:
+        main()
+    else:
+        print(json.dumps(compute_results(args.data, args.solver, args.relaxed, args.cache), ensure_ascii=False))
+    
+    if args.metrics:
+        metrics.export(args.metrics, {"argv": sys.argv[1:] if argv is None else argv})
+    return 0
+
 if __name__ == "__main__":
-    result = main()
+    raise SystemExit(cli())
@@ -3,11 +3,13 @@
 Основні функції для методу Монте-Карло
 """
 
+import ast
 import numpy as np
-import matplotlib.pyplot as plt
-import scipy.integrate as spi
-import random
-from typing import Tuple, List
+from typing import Tuple, List, Optional, Iterator, AsyncIterator
+from cache import ResultCache, UncacheableError, integrand_key, make_key
+from expressions import CompiledIntegrand, compile_integrand
+from parallel import run_workers
+import metrics
 
 def f(x):
     """
@@ -36,86 +38,1010 @@ def analytical_integral(a: float, b: float) -> float:
     """
     return (b**3 / 3) - (a**3 / 3)
 
-def monte_carlo_integration(func, a: float, b: float, n: int) -> Tuple[float, List[float]]:
+CHUNK_SIZE = 1 << 20
+
+HISTORY_MODES = ("full", "every", "log", "points", "at", "none")
+
+def history_indices(n: int, history: str = "full", checkpoints=1000) -> np.ndarray:
+    """
+    Визначає номери точок (від 1 до n), для яких зберігається наближення в історії збіжності.
+    
+    Args:
+        n: Загальна кількість випадкових точок
+        history: Режим історії: "full" - кожна точка, "every" - кожна k-та точка,
+            "log" - логарифмічно розподілені точки, "points" - фіксована кількість
+            рівномірно розподілених точок, "at" - задані номери точок, "none" - без історії
+        checkpoints: Крок k для режиму "every", кількість точок для "log"/"points"
+            або послідовність номерів точок для "at"
+        
+    Returns:
+        np.ndarray: Зростаючий масив номерів точок (останній завжди дорівнює n)
+    """
+    if history not in HISTORY_MODES:
+        raise ValueError(f"Невідомий режим історії: {history!r}. Допустимі: {HISTORY_MODES}")
+    if history == "none" or n <= 0:
+        return np.empty(0, dtype=np.int64)
+    if history == "full":
+        return np.arange(1, n + 1, dtype=np.int64)
+    if history == "at":
+        indices = np.unique(np.asarray(checkpoints, dtype=np.int64))
+        if indices.size and (indices[0] < 1 or indices[-1] > n):
+            raise ValueError(f"Номери контрольних точок мають бути в межах [1, {n}]")
+        return indices if indices.size and indices[-1] == n else np.append(indices, n)
+    if checkpoints < 1:
+        raise ValueError("checkpoints має бути додатним цілим числом")
+    
+    if history == "every":
+        indices = np.arange(checkpoints, n + 1, checkpoints, dtype=np.int64)
+    elif history == "log":
+        indices = np.rint(np.geomspace(1, n, num=min(checkpoints, n))).astype(np.int64)
+    else:
+        indices = np.rint(np.linspace(1, n, num=min(checkpoints, n))).astype(np.int64)
+    
+    indices = np.unique(indices)
+    if indices.size == 0 or indices[-1] != n:
+        indices = np.append(indices, n)
+    return indices
+
+def _prefix_sums(values: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Обчислює префіксні суми values[:i] лише для номерів i з indices.
+    
+    Пам'ять пропорційна кількості контрольних точок, а не довжині values.
+    Очікує зростаючі indices у межах [1, len(values)].
+    """
+    if indices.size == 0:
+        return np.empty(0)
+    starts = np.concatenate(([0], indices[:-1]))
+    return np.cumsum(np.add.reduceat(values[:indices[-1]], starts))
+
+def _as_integrand(func):
+    """
+    Рядок з виразом або AST компілює в CompiledIntegrand; інші функції повертає без змін.
+    """
+    if isinstance(func, str) or isinstance(func, ast.AST):
+        return compile_integrand(func)
+    return func
+
+def _evaluate(func, x: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Обчислює func на масиві x. Якщо функція не векторизована (працює лише
+    зі скалярами), застосовує її поелементно через np.vectorize.
+    Скомпільовані вирази пишуть результат у out без виділення пам'яті.
+    """
+    if isinstance(func, CompiledIntegrand):
+        return func(x, out=out)
+    try:
+        values = np.asarray(func(x), dtype=float)
+    except (TypeError, ValueError):
+        values = None
+    if values is None or values.shape != x.shape:
+        values = np.vectorize(func, otypes=[float])(x)
+    return values
+
+def _split_budget(n: int, workers: int) -> List[int]:
+    """
+    Розподіляє n точок між workers потоками якомога рівніше.
+    """
+    base, extra = divmod(n, workers)
+    return [base + (1 if i < extra else 0) for i in range(workers)]
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    """
+    Повертає кількість процесів (None - усі доступні ядра).
+    """
+    if workers is None:
+        import os
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers має бути додатним цілим числом")
+    return workers
+
+SAMPLERS = ("random", "sobol", "halton")
+
+def _make_sampler(sampler: str, seed_sequence: np.random.SeedSequence, dimensions: int = 1):
+    """
+    Створює джерело рівномірних точок у [0, 1)^dimensions.
+    
+    "random" - псевдовипадковий генератор NumPy, "sobol" та "halton" -
+    скрембльовані послідовності низької розбіжності (квазі-Монте-Карло).
+    Послідовні виклики продовжують ту саму послідовність.
+    
+    Returns:
+        Callable[[int], np.ndarray]: draw(size) -> масив форми (size, dimensions)
+    """
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Невідомий генератор точок: {sampler!r}. Допустимі: {SAMPLERS}")
+    rng = np.random.default_rng(seed_sequence)
+    if sampler == "random":
+        return lambda size: rng.random((size, dimensions))
+    
+    import warnings
+    from scipy.stats import qmc
+    engine_type = qmc.Sobol if sampler == "sobol" else qmc.Halton
+    engine = engine_type(dimensions, scramble=True, rng=rng)
+    
+    def draw(size):
+        # Sobol попереджає про кількість точок, що не є степенем двійки;
+        # для сумісності з довільними n це попередження ігнорується
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            return engine.random(size)
+    
+    return draw
+
+def _integration_worker(func, a: float, b: float, count: int,
+                        seed_sequence: np.random.SeedSequence,
+                        local_indices: np.ndarray, chunk_size: int,
+                        sampler: str = "random",
+                        moments: bool = False) -> Tuple[float, np.ndarray, float]:
+    """
+    Обробляє частину вибірки одного потоку генератора.
+    
+    Сума квадратів відхилень (для стандартної похибки) рахується лише з
+    moments=True - це ще один прохід по кожному блоку.
+    
+    Returns:
+        Tuple[float, np.ndarray, float]: (сума значень функції, префіксні суми в
+            local_indices, сума квадратів відхилень від середнього або 0.0)
+    """
+    draw = _make_sampler(sampler, seed_sequence)
+    prefix = np.empty(local_indices.size)
+    values_buffer = np.empty(max(1, min(chunk_size, count)))
+    running_sum = 0.0
+    position = 0
+    cursor = 0
+    mean, m2 = 0.0, 0.0
+    
+    while position < count:
+        size = min(chunk_size, count - position)
+        x = a + (b - a) * draw(size)[:, 0]
+        values = _evaluate(func, x, values_buffer[:size])
+        
+        # Контрольні точки, що потрапляють у поточний блок
+        stop = np.searchsorted(local_indices, position + size, side="right")
+        if stop > cursor:
+            prefix[cursor:stop] = running_sum + _prefix_sums(values, local_indices[cursor:stop] - position)
+            cursor = stop
+        
+        running_sum += float(np.sum(values))
+        if moments:
+            _, mean, m2 = _merge_moments(position, mean, m2, values)
+        position += size
+    
+    return running_sum, prefix, float(m2)
+
+def _geometric_worker(func, a: float, b: float, y_max: float, count: int,
+                      seed_sequence: np.random.SeedSequence, chunk_size: int,
+                      sampler: str = "random") -> int:
+    """
+    Підраховує точки під кривою для однієї частини вибірки.
+    """
+    if sampler != "random":
+        return _geometric_worker_qmc(func, a, b, y_max, count, seed_sequence, chunk_size, sampler)
+    
+    rng = np.random.default_rng(seed_sequence)
+    buffer_size = max(1, min(chunk_size, count))
+    x_buffer = np.empty(buffer_size)
+    y_buffer = np.empty(buffer_size)
+    values_buffer = np.empty(buffer_size)
+    
+    points_under_curve = 0
+    remaining = count
+    while remaining > 0:
+        size = min(buffer_size, remaining)
+        x = x_buffer[:size]
+        y = y_buffer[:size]
+        
+        rng.random(out=x)
+        x *= (b - a)
+        x += a
+        rng.random(out=y)
+        y *= y_max
+        
+        # Підраховуємо точки, що знаходяться під кривою
+        points_under_curve += int(np.count_nonzero(y <= _evaluate(func, x, values_buffer[:size])))
+        remaining -= size
+    
+    return points_under_curve
+
+def _geometric_worker_qmc(func, a: float, b: float, y_max: float, count: int,
+                          seed_sequence: np.random.SeedSequence, chunk_size: int,
+                          sampler: str) -> int:
+    """
+    Варіант _geometric_worker для двовимірних квазівипадкових точок (x, y).
+    """
+    draw = _make_sampler(sampler, seed_sequence, dimensions=2)
+    points_under_curve = 0
+    remaining = count
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        points = draw(size)
+        x = a + (b - a) * points[:, 0]
+        y = y_max * points[:, 1]
+        points_under_curve += int(np.count_nonzero(y <= _evaluate(func, x)))
+        remaining -= size
+    return points_under_curve
+
+def monte_carlo_integration(func, a: float, b: float, n: int,
+                            history: str = "full",
+                            checkpoints: int = 1000,
+                            seed: Optional[int] = None,
+                            workers: Optional[int] = 1,
+                            chunk_size: int = CHUNK_SIZE,
+                            sampler: str = "random") -> Tuple[float, List[float]]:
     """
     Обчислення інтеграла методом Монте-Карло.
     
+    Вибірка ділиться між workers процесами; кожен отримує незалежний потік
+    генератора, породжений від seed через np.random.SeedSequence. Часткові суми
+    об'єднуються у фіксованому порядку, тому для однакових seed і workers
+    результат відтворюється біт-у-біт.
+    
     Args:
-        func: Функція для інтегрування
+        func: Функція для інтегрування (для workers > 1 має серіалізуватися pickle)
+            або рядок з виразом, напр. "x**2 * sin(x)" (див. expressions.compile_integrand)
         a: Нижня межа інтегрування  
         b: Верхня межа інтегрування
         n: Кількість випадкових точок
+        history: Режим історії наближень (див. history_indices); "none" - без історії
+        checkpoints: Крок або кількість контрольних точок для режимів "every", "log", "points"
+        seed: Зерно генератора (None - випадкове)
+        workers: Кількість процесів (None - усі доступні ядра)
+        chunk_size: Розмір блоку точок, що обробляється за один крок
+        sampler: Генератор точок: "random", "sobol" або "halton" (див. SAMPLERS);
+            у паралельному режимі кожен процес використовує власну скрембльовану послідовність
         
     Returns:
         Tuple[float, List[float]]: (оцінка інтеграла, історія наближень)
     """
+    started = metrics.clock()
+    func = _as_integrand(func)
+    workers = _resolve_workers(workers)
+    seed_sequences = np.random.SeedSequence(seed).spawn(workers)
+    counts = _split_budget(n, workers)
+    indices = history_indices(n, history, checkpoints)
+    
+    # Кожен потік отримує лише ті контрольні точки, що потрапляють у його діапазон
+    tasks = []
+    start = 0
+    for count, seed_sequence in zip(counts, seed_sequences):
+        mask = (indices > start) & (indices <= start + count)
+        tasks.append((func, a, b, count, seed_sequence, indices[mask] - start, chunk_size, sampler,
+                      started is not None))
+        start += count
     
-    # Генеруємо випадкові точки x в інтервалі [a, b]
-    random_x = np.random.uniform(a, b, n)
+    results = run_workers(_integration_worker, tasks, workers)
     
-    # Обчислюємо значення функції в цих точках
-    function_values = func(random_x)
+    # Об'єднуємо часткові суми у фіксованому порядку потоків
+    total_sum = 0.0
+    running_sums = []
+    for partial_sum, prefix, _ in results:
+        running_sums.append(total_sum + prefix)
+        total_sum += partial_sum
     
     # Оцінка інтеграла: (b-a) * середнє значення функції
-    integral_estimate = (b - a) * np.mean(function_values)
+    integral_estimate = (b - a) * total_sum / n
+    
+    history_values = (b - a) * np.concatenate(running_sums) / indices
+    
+    # Дисперсію потоки рахують лише при ввімкнених метриках (зайвий прохід по
+    # кожному блоку), тож і похибка обчислюється лише тоді
+    if started is not None:
+        merged, mean, m2 = 0, 0.0, 0.0
+        for count, (partial_sum, _, partial_m2) in zip(counts, results):
+            if count > 0:
+                total = merged + count
+                delta = partial_sum / count - mean
+                mean += delta * count / total
+                m2 += partial_m2 + delta ** 2 * merged * count / total
+                merged = total
+        std_error = abs(b - a) * float(np.sqrt(m2 / (n - 1) / n)) if n > 1 else 0.0
+        metrics.record("task2.monte_carlo", started, samples=n, workers=workers, sampler=sampler,
+                       se=std_error)
+    return integral_estimate, history_values.tolist()
+
+def qmc_integration(func, a: float, b: float, n: int,
+                    sampler: str = "sobol",
+                    replicates: int = 8,
+                    seed: Optional[int] = None,
+                    workers: Optional[int] = 1) -> Tuple[float, float]:
+    """
+    Рандомізований квазі-Монте-Карло з оцінкою похибки.
+    
+    n точок ділиться між replicates незалежно скрембльованими послідовностями;
+    розкид оцінок між ними дає стандартну похибку.
+    
+    Args:
+        func: Функція для інтегрування або рядок з виразом (див. expressions)
+        a: Нижня межа інтегрування
+        b: Верхня межа інтегрування
+        n: Загальна кількість точок (будь-яке число, не обов'язково степінь двійки)
+        sampler: "sobol", "halton" або "random"
+        replicates: Кількість незалежних реплік (щонайменше 2)
+        seed: Зерно генератора (None - випадкове)
+        workers: Кількість процесів (None - усі доступні ядра)
+        
+    Returns:
+        Tuple[float, float]: (оцінка інтеграла, стандартна похибка)
+    """
+    if replicates < 2:
+        raise ValueError("Для оцінки похибки потрібно щонайменше 2 репліки")
+    
+    started = metrics.clock()
+    func = _as_integrand(func)
+    workers = min(_resolve_workers(workers), replicates)
+    counts = _split_budget(n, replicates)
+    seed_sequences = np.random.SeedSequence(seed).spawn(replicates)
+    no_history = np.empty(0, dtype=np.int64)
+    tasks = [(func, a, b, count, seed_sequence, no_history, CHUNK_SIZE, sampler)
+             for count, seed_sequence in zip(counts, seed_sequences)]
+    
+    sums = np.array([partial_sum for partial_sum, _, _ in run_workers(_integration_worker, tasks, workers)])
+    estimates = (b - a) * sums / np.array(counts)
+    
+    # Загальна оцінка зважена кількістю точок у репліках
+    estimate = (b - a) * float(np.sum(sums)) / n
+    std_error = float(np.std(estimates, ddof=1) / np.sqrt(replicates))
+    metrics.record("task2.qmc", started, samples=n, workers=workers, sampler=sampler, se=std_error)
+    return estimate, std_error
+
+def _merge_moments(count: int, mean, m2, values: np.ndarray):
+    """
+    Додає блок values (уздовж останньої осі) до накопичених кількості, середнього
+    та суми квадратів відхилень m2 за формулою Чана - без втрати точності, яку
+    дає різниця total_sq / n - mean^2 при великих n і значеннях.
+    
+    Returns:
+        Tuple: (кількість, середнє, m2) після об'єднання
+    """
+    size = values.shape[-1]
+    batch_mean = values.mean(axis=-1)
+    batch_m2 = ((values - batch_mean[..., None]) ** 2).sum(axis=-1)
+    total = count + size
+    delta = batch_mean - mean
+    return total, mean + delta * size / total, m2 + batch_m2 + delta ** 2 * count * size / total
+
+def monte_carlo_integration_nd(func, bounds, n: int,
+                               seed: Optional[int] = None,
+                               sampler: str = "random",
+                               chunk_size: int = CHUNK_SIZE) -> Tuple[float, float]:
+    """
+    Метод Монте-Карло для d-вимірного гіперпрямокутника.
+    
+    Args:
+        func: Векторизована функція: масив точок форми (size, d) -> масив (size,)
+        bounds: Межі по кожній осі: [(low_1, high_1), ..., (low_d, high_d)]
+        n: Кількість випадкових точок
+        seed: Зерно генератора (None - випадкове)
+        sampler: Генератор точок: "random", "sobol" або "halton"
+        chunk_size: Максимальна кількість чисел в одному блоці точок
+        
+    Returns:
+        Tuple[float, float]: (оцінка інтеграла, стандартна похибка)
+    """
+    started = metrics.clock()
+    bounds = np.asarray(bounds, dtype=float).reshape(-1, 2)
+    lows = bounds[:, 0]
+    widths = bounds[:, 1] - lows
+    dimensions = len(bounds)
+    volume = float(np.prod(widths))
+    
+    draw = _make_sampler(sampler, np.random.SeedSequence(seed), dimensions)
+    block = max(1, chunk_size // dimensions)
+    
+    count, mean, m2 = 0, 0.0, 0.0
+    while count < n:
+        size = min(block, n - count)
+        values = np.asarray(func(lows + widths * draw(size)), dtype=float).reshape(size)
+        count, mean, m2 = _merge_moments(count, mean, m2, values)
+    
+    mean = float(mean)
+    variance = float(m2) / (n - 1) if n > 1 else 0.0
+    std_error = abs(volume) * float(np.sqrt(variance / n))
+    metrics.record("task2.monte_carlo_nd", started, samples=n, dimensions=dimensions,
+                   sampler=sampler, se=std_error)
+    return volume * mean, std_error
+
+def monte_carlo_integration_batch(func, intervals, n: int,
+                                  params=None,
+                                  seed: Optional[int] = None,
+                                  sampler: str = "random",
+                                  chunk_size: int = CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Обчислює інтеграли на багатьох інтервалах (і для багатьох наборів параметрів)
+    за один векторизований прохід по спільній матриці випадкових точок.
+    
+    Спільні випадкові числа також роблять різниці між оцінками менш шумними,
+    ніж при окремих викликах monte_carlo_integration.
+    
+    Args:
+        func: Векторизована функція func(x) або func(x, p), якщо задано params.
+            x має форму (m, size) без параметрів або (1, m, size) з параметрами;
+            p має форму (k, 1, 1) для скалярних параметрів або (k, 1, 1, p_dim)
+        intervals: Масив інтервалів форми (m, 2): [(a_1, b_1), ..., (a_m, b_m)]
+        n: Кількість випадкових точок на кожен інтеграл
+        params: Необов'язковий масив k наборів параметрів форми (k,) або (k, p_dim)
+        seed: Зерно генератора (None - випадкове)
+        sampler: Генератор точок: "random", "sobol" або "halton"
+        chunk_size: Максимальна кількість значень функції в одному блоці
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (оцінки інтегралів, стандартні похибки)
+            форми (m,) або (k, m), якщо задано params
+    """
+    started = metrics.clock()
+    intervals = np.asarray(intervals, dtype=float).reshape(-1, 2)
+    lows = intervals[:, :1]
+    widths = intervals[:, 1:] - lows
+    
+    if params is not None:
+        params = np.asarray(params, dtype=float)
+        params = params.reshape(len(params), 1, 1, *params.shape[1:])
+        shape = (len(params), len(intervals))
+        lows, widths = lows[None], widths[None]
+    else:
+        shape = (len(intervals),)
+    
+    draw = _make_sampler(sampler, np.random.SeedSequence(seed))
+    block = max(1, chunk_size // int(np.prod(shape)))
+    
+    count, mean, m2 = 0, np.zeros(shape), np.zeros(shape)
+    while count < n:
+        size = min(block, n - count)
+        x = lows + widths * draw(size)[:, 0]
+        values = func(x) if params is None else func(x, params)
+        values = np.broadcast_to(np.asarray(values, dtype=float), shape + (size,))
+        count, mean, m2 = _merge_moments(count, mean, m2, values)
+    
+    widths = widths[..., 0]
+    variance = m2 / max(n - 1, 1)
+    std_errors = np.abs(widths) * np.sqrt(variance / n)
+    metrics.record("task2.monte_carlo_batch", started, samples=n * int(np.prod(shape)),
+                   integrals=int(np.prod(shape)), sampler=sampler, se_max=float(np.max(std_errors)))
+    return widths * mean, std_errors
+
+def adaptive_monte_carlo_integration(func, a: float, b: float,
+                                     abs_tol: Optional[float] = None,
+                                     rel_tol: Optional[float] = None,
+                                     confidence: float = 0.95,
+                                     batch_size: int = 10_000,
+                                     max_samples: int = 10_000_000,
+                                     max_time: Optional[float] = None,
+                                     seed: Optional[int] = None) -> Tuple[float, float, int, bool]:
+    """
+    Адаптивний метод Монте-Карло: генерує точки блоками та зупиняється, щойно
+    півширина довірчого інтервалу стає не більшою за задану точність.
+    
+    Середнє та дисперсія оновлюються потоково (об'єднанням статистик блоків),
+    тому пам'ять обмежена розміром одного блоку.
+    
+    Args:
+        func: Функція для інтегрування або рядок з виразом (див. expressions)
+        a: Нижня межа інтегрування
+        b: Верхня межа інтегрування
+        abs_tol: Допустима абсолютна похибка
+        rel_tol: Допустима відносна похибка (частка від оцінки, напр. 0.01 = 1%)
+        confidence: Рівень довіри для довірчого інтервалу
+        batch_size: Кількість точок в одному блоці
+        max_samples: Максимальна кількість точок
+        max_time: Максимальний час обчислення в секундах (None - без обмеження)
+        seed: Зерно генератора (None - випадкове)
+        
+    Returns:
+        Tuple[float, float, int, bool]: (оцінка інтеграла, стандартна похибка,
+            використано точок, чи досягнуто заданої точності)
+    """
+    if abs_tol is None and rel_tol is None:
+        raise ValueError("Потрібно задати abs_tol або rel_tol")
+    
+    import time
+    from statistics import NormalDist
+    
+    started = metrics.clock()
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    deadline = None if max_time is None else time.perf_counter() + max_time
+    
+    estimate = 0.0
+    std_error = float("inf")
+    count = 0
+    converged = False
+    
+    for estimate, std_error, count in monte_carlo_stream(func, a, b, batch_size=batch_size,
+                                                         max_samples=max_samples, seed=seed):
+        # Досить досягти будь-якої із заданих точностей
+        tolerance = max(abs_tol or 0.0, (rel_tol or 0.0) * abs(estimate))
+        if z * std_error <= tolerance:
+            converged = True
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+    
+    metrics.record("task2.adaptive", started, samples=count, se=std_error, converged=converged)
+    return estimate, std_error, count, converged
+
+def monte_carlo_stream(func, a: float, b: float,
+                       batch_size: int = 10_000,
+                       max_samples: Optional[int] = None,
+                       seed: Optional[int] = None,
+                       sampler: str = "random",
+                       stop=None) -> Iterator[Tuple[float, float, int]]:
+    """
+    Генератор поточних оцінок методу Монте-Карло після кожного блоку точок.
+    
+    Зберігаються лише середнє та сума квадратів відхилень, тому пам'ять
+    обмежена одним блоком. Зупинити обчислення можна, просто перестати
+    читати генератор (або викликати close()), чи встановити подію stop.
+    
+    Args:
+        func: Функція для інтегрування або рядок з виразом (див. expressions)
+        a: Нижня межа інтегрування
+        b: Верхня межа інтегрування
+        batch_size: Кількість точок в одному блоці
+        max_samples: Максимальна кількість точок (None - без обмеження)
+        seed: Зерно генератора (None - випадкове)
+        sampler: Генератор точок: "random", "sobol" або "halton"
+        stop: Об'єкт з методом is_set() (напр. threading.Event) для скасування
+        
+    Yields:
+        Tuple[float, float, int]: (оцінка інтеграла, стандартна похибка, використано точок)
+    """
+    func = _as_integrand(func)
+    draw = _make_sampler(sampler, np.random.SeedSequence(seed))
+    
+    count = 0
+    mean = 0.0
+    m2 = 0.0  # Сума квадратів відхилень від середнього
+    std_error = float("inf")
+    
+    while max_samples is None or count < max_samples:
+        if stop is not None and stop.is_set():
+            return
+        size = batch_size if max_samples is None else min(batch_size, max_samples - count)
+        values = _evaluate(func, a + (b - a) * draw(size)[:, 0])
+        
+        # Об'єднуємо статистики блоку з накопиченими (формула Чана)
+        count, mean, m2 = _merge_moments(count, mean, m2, np.asarray(values, dtype=float))
+        
+        if count > 1:
+            std_error = abs(b - a) * float(np.sqrt(m2 / (count - 1) / count))
+        yield (b - a) * float(mean), std_error, count
+
+async def monte_carlo_astream(func, a: float, b: float,
+                              batch_size: int = 10_000,
+                              max_samples: Optional[int] = None,
+                              seed: Optional[int] = None,
+                              sampler: str = "random") -> AsyncIterator[Tuple[float, float, int]]:
+    """
+    Асинхронна версія monte_carlo_stream для asyncio.
+    
+    Кожен блок обчислюється в окремому потоці, тож цикл подій не блокується.
+    Скасування задачі або вихід з async for зупиняє обчислення після
+    поточного блоку.
+    
+    Yields:
+        Tuple[float, float, int]: (оцінка інтеграла, стандартна похибка, використано точок)
+    """
+    import asyncio
+    import threading
+    
+    stop = threading.Event()
+    stream = monte_carlo_stream(func, a, b, batch_size=batch_size, max_samples=max_samples,
+                                seed=seed, sampler=sampler, stop=stop)
+    finished = object()
+    try:
+        while True:
+            item = await asyncio.to_thread(next, stream, finished)
+            if item is finished:
+                return
+            yield item
+    finally:
+        # Генератор може ще виконуватися в потоці, тому зупиняємо його через подію
+        stop.set()
+
+VARIANCE_REDUCTION_METHODS = ("crude", "stratified", "antithetic", "control", "importance")
+
+def linear_density(a: float, b: float):
+    """
+    Щільність p(x), пропорційна x на [a, b] (0 <= a < b), для вибірки за значущістю.
+    
+    Returns:
+        Tuple: (pdf(x), sample(rng, size)) - щільність і генератор точок
+        (обернена функція розподілу)
+    """
+    if a < 0 or b <= a:
+        raise ValueError("Лінійна щільність визначена лише для 0 <= a < b")
+    norm = b ** 2 - a ** 2
+    
+    def pdf(x):
+        return 2 * x / norm
     
-    # Зберігаємо історію наближень для аналізу збіжності
-    history = []
-    running_sum = 0
+    def sample(rng, size):
+        return np.sqrt(a ** 2 + rng.random(size) * norm)
     
-    for i in range(n):
-        running_sum += function_values[i]
-        current_estimate = (b - a) * running_sum / (i + 1)
-        history.append(current_estimate)
+    return pdf, sample
+
+def linear_control(a: float, b: float):
+    """
+    Контрольна змінна g(x) = x для методу "control": корелює з будь-якою
+    монотонною на [a, b] функцією, а її інтеграл відомий точно.
+    
+    Returns:
+        Tuple: (g(x), інтеграл g на [a, b] = (b^2 - a^2) / 2)
+    """
+    def control(x):
+        return x
     
-    return integral_estimate, history
+    return control, (b ** 2 - a ** 2) / 2
 
-def monte_carlo_geometric_method(func, a: float, b: float, n: int) -> Tuple[float, int, int]:
+def monte_carlo_variance_reduced(func, a: float, b: float, n: int,
+                                 method: str = "stratified",
+                                 seed: Optional[int] = None,
+                                 strata: Optional[int] = None,
+                                 control=None,
+                                 control_integral: Optional[float] = None,
+                                 density=None) -> Tuple[float, float]:
+    """
+    Метод Монте-Карло зі зменшенням дисперсії.
+    
+    Методи:
+        "crude" - звичайний метод Монте-Карло (для порівняння)
+        "stratified" - стратифікована вибірка: [a, b] ділиться на рівні страти
+        "antithetic" - антитетичні пари x та a + b - x
+        "control" - контрольна змінна g з відомим інтегралом; за замовчуванням
+            g(x) = x (див. linear_control)
+        "importance" - вибірка за значущістю зі щільністю density = (pdf, sample)
+    
+    Args:
+        func: Функція для інтегрування або рядок з виразом (див. expressions)
+        a: Нижня межа інтегрування
+        b: Верхня межа інтегрування
+        n: Кількість обчислень функції
+        method: Метод зменшення дисперсії (див. VARIANCE_REDUCTION_METHODS)
+        seed: Зерно генератора (None - випадкове)
+        strata: Кількість страт (за замовчуванням ~√n)
+        control: Контрольна функція g(x)
+        control_integral: Точне значення інтеграла g на [a, b]
+        density: Пара (pdf(x), sample(rng, size)) для методу "importance"
+        
+    Returns:
+        Tuple[float, float]: (оцінка інтеграла, дисперсія оцінки)
+    """
+    if method not in VARIANCE_REDUCTION_METHODS:
+        raise ValueError(f"Невідомий метод: {method!r}. Допустимі: {VARIANCE_REDUCTION_METHODS}")
+    if n < 2:
+        raise ValueError("Для оцінки дисперсії потрібно щонайменше 2 точки")
+    
+    started = metrics.clock()
+    func = _as_integrand(func)
+    if control is not None:
+        control = _as_integrand(control)
+    estimate, variance = _variance_reduced_estimate(func, a, b, n, method, np.random.default_rng(seed),
+                                                    strata, control, control_integral, density)
+    metrics.record("task2.variance_reduced", started, samples=n, method=method,
+                   se=float(np.sqrt(variance)))
+    return estimate, variance
+
+def _variance_reduced_estimate(func, a: float, b: float, n: int, method: str, rng,
+                               strata, control, control_integral, density) -> Tuple[float, float]:
+    """
+    Обчислення для monte_carlo_variance_reduced (параметри вже перевірено).
+    """
+    width = b - a
+    
+    if method == "crude":
+        values = _evaluate(func, a + width * rng.random(n))
+        return width * float(np.mean(values)), width ** 2 * float(np.var(values, ddof=1)) / n
+    
+    if method == "stratified":
+        # Рівні страти, щонайменше по 2 точки в кожній для оцінки дисперсії
+        m = strata if strata is not None else max(1, int(np.sqrt(n)))
+        m = max(1, min(m, n // 2))
+        counts = np.array(_split_budget(n, m))
+        stratum = np.repeat(np.arange(m), counts)
+        values = _evaluate(func, a + width * (stratum + rng.random(n)) / m)
+        
+        sums = np.bincount(stratum, weights=values, minlength=m)
+        sums_sq = np.bincount(stratum, weights=values ** 2, minlength=m)
+        means = sums / counts
+        variances = np.maximum(sums_sq - counts * means ** 2, 0.0) / (counts - 1)
+        
+        estimate = width * float(np.mean(means))
+        variance = (width / m) ** 2 * float(np.sum(variances / counts))
+        return estimate, variance
+    
+    if method == "antithetic":
+        pairs = n // 2
+        x = a + width * rng.random(pairs)
+        values = (_evaluate(func, x) + _evaluate(func, a + b - x)) / 2
+        return width * float(np.mean(values)), width ** 2 * float(np.var(values, ddof=1)) / pairs
+    
+    if method == "control":
+        if control is None:
+            control, control_integral = linear_control(a, b)
+        elif control_integral is None:
+            raise ValueError("Для власної контрольної функції потрібен control_integral")
+        
+        x = a + width * rng.random(n)
+        values = _evaluate(func, x)
+        control_values = _evaluate(control, x)
+        
+        # Оптимальний коефіцієнт c = cov(f, g) / var(g)
+        control_variance = float(np.var(control_values, ddof=1))
+        coefficient = 0.0
+        if control_variance > 0:
+            coefficient = float(np.cov(values, control_values)[0, 1]) / control_variance
+        adjusted = values - coefficient * (control_values - control_integral / width)
+        return width * float(np.mean(adjusted)), width ** 2 * float(np.var(adjusted, ddof=1)) / n
+    
+    # method == "importance"
+    if density is None:
+        raise ValueError("Для методу 'importance' потрібна щільність density = (pdf, sample)")
+    pdf, sample = density
+    x = np.asarray(sample(rng, n), dtype=float)
+    values = _evaluate(func, x) / _evaluate(pdf, x)
+    return float(np.mean(values)), float(np.var(values, ddof=1)) / n
+
+def monte_carlo_geometric_method(func, a: float, b: float, n: int,
+                                 chunk_size: int = CHUNK_SIZE,
+                                 seed: Optional[int] = None,
+                                 workers: Optional[int] = 1,
+                                 sampler: str = "random") -> Tuple[float, int, int]:
     """
     Геометричний метод Монте-Карло (підрахунок точок під кривою).
     
+    Точки генеруються та перевіряються блоками по chunk_size у заздалегідь
+    виділених буферах, тому використання пам'яті не залежить від n.
+    Паралельний режим працює так само, як у monte_carlo_integration.
+    
     Args:
-        func: Функція для інтегрування
+        func: Функція для інтегрування або рядок з виразом (див. expressions)
         a: Нижня межа інтегрування
         b: Верхня межа інтегрування  
         n: Кількість випадкових точок
+        chunk_size: Кількість точок, що обробляються за один векторизований крок
+        seed: Зерно генератора (None - випадкове)
+        workers: Кількість процесів (None - усі доступні ядра)
+        sampler: Генератор точок: "random", "sobol" або "halton" (див. SAMPLERS)
         
     Returns:
         Tuple[float, int, int]: (оцінка інтеграла, точки під кривою, загальна кількість точок)
     """
     
-    # Знаходимо максимальне значення функції на інтервалі для визначення прямокутника
-    x_range = np.linspace(a, b, 1000)
-    y_max = np.max(func(x_range))
+    started = metrics.clock()
+    func = _as_integrand(func)
     
-    points_under_curve = 0
-    total_points = n
+    # Знаходимо максимальне значення функції на інтервалі для визначення прямокутника;
+    # скомпільовані вирази зберігають цю оцінку для кожного інтервалу
+    if isinstance(func, CompiledIntegrand):
+        y_max = func.y_range(a, b)[1]
+    else:
+        x_range = np.linspace(a, b, 1000)
+        y_max = float(np.max(_evaluate(func, x_range)))
     
-    # Генеруємо випадкові точки в прямокутнику [a, b] × [0, y_max]
-    for _ in range(n):
-        x = random.uniform(a, b)
-        y = random.uniform(0, y_max)
-        
-        # Перевіряємо, чи точка знаходиться під кривою
-        if y <= func(x):
-            points_under_curve += 1
+    workers = _resolve_workers(workers)
+    seed_sequences = np.random.SeedSequence(seed).spawn(workers)
+    tasks = [(func, a, b, y_max, count, seed_sequence, chunk_size, sampler)
+             for count, seed_sequence in zip(_split_budget(n, workers), seed_sequences)]
+    
+    points_under_curve = sum(run_workers(_geometric_worker, tasks, workers))
+    total_points = n
     
     # Площа під кривою = (площа прямокутника) × (частка точок під кривою)
     rectangle_area = (b - a) * y_max
     integral_estimate = rectangle_area * (points_under_curve / total_points)
     
+    share = points_under_curve / total_points
+    std_error = abs(rectangle_area) * float(np.sqrt(share * (1 - share) / total_points))
+    metrics.record("task2.geometric", started, samples=n, workers=workers, sampler=sampler, se=std_error)
     return integral_estimate, points_under_curve, total_points
 
-def plot_function_and_integration(a: float, b: float):
+def _quad(func, a: float, b: float, **params) -> Tuple[float, float]:
+    """
+    Обчислення інтеграла scipy.integrate.quad (SciPy імпортується лише тут).
+    """
+    import scipy.integrate as spi
+    return spi.quad(func, a, b, **params)
+
+CACHED_METHODS = ("analytical", "quad", "monte_carlo", "geometric", "adaptive",
+                  "qmc", "variance_reduced")
+
+_result_cache = ResultCache()
+
+def configure_cache(maxsize: int = 256, path: Optional[str] = None) -> ResultCache:
+    """
+    Замінює кеш результатів інтегрування.
+    
+    Args:
+        maxsize: Максимальна кількість записів у пам'яті
+        path: Каталог для збереження результатів на диску (None - лише в пам'яті)
+        
+    Returns:
+        ResultCache: Новий кеш
+    """
+    global _result_cache
+    _result_cache = ResultCache(maxsize=maxsize, path=path)
+    return _result_cache
+
+def _key_params(function, params: dict) -> dict:
+    """
+    Параметри для ключа кешу: разом зі значеннями за замовчуванням (зокрема
+    chunk_size - порядок підсумовування змінює останні біти результату) і з
+    фактичною кількістю процесів замість workers=None (залежить від машини).
+    """
+    import inspect
+    
+    signature = inspect.signature(function)
+    bound = signature.bind_partial(**params)
+    bound.apply_defaults()
+    arguments = {}
+    for name, value in bound.arguments.items():
+        if signature.parameters[name].kind is inspect.Parameter.VAR_KEYWORD:
+            arguments.update(value)
+        else:
+            arguments[name] = value
+    if "workers" in arguments:
+        arguments["workers"] = _resolve_workers(arguments["workers"])
+    return arguments
+
+def cached_integral(method: str, func, a: float, b: float, **params):
+    """
+    Обчислює інтеграл вказаним методом із запам'ятовуванням результату.
+    
+    Ключ кешу - ідентичність функції (integrand_key), межі, метод і параметри
+    разом зі значеннями за замовчуванням та фактичною кількістю процесів
+    (див. _key_params), тож результат з кешу збігається зі свіжим біт-у-біт.
+    Функції, що залежать від об'єктів без стабільної ідентичності, не кешуються.
+    Стохастичні методи кешуються лише із заданим seed, бо лише тоді
+    результат відтворюваний.
+    
+    Args:
+        method: Один з CACHED_METHODS
+        func: Функція для інтегрування або рядок з виразом (див. expressions)
+        a: Нижня межа інтегрування
+        b: Верхня межа інтегрування
+        **params: Параметри відповідної функції (n, seed, workers, sampler, ...)
+        
+    Returns:
+        Результат відповідної функції без змін
+    """
+    if method not in CACHED_METHODS:
+        raise ValueError(f"Невідомий метод: {method!r}. Допустимі: {CACHED_METHODS}")
+    func = _as_integrand(func)
+    if method == "analytical" and func is not f:
+        raise ValueError("Аналітичний інтеграл відомий лише для f(x) = x²")
+    
+    functions = {
+        "quad": _quad,
+        "monte_carlo": monte_carlo_integration,
+        "geometric": monte_carlo_geometric_method,
+        "adaptive": adaptive_monte_carlo_integration,
+        "qmc": qmc_integration,
+        "variance_reduced": monte_carlo_variance_reduced,
+    }
+    if method == "analytical":
+        compute = lambda: analytical_integral(a, b)
+    else:
+        compute = lambda: functions[method](func, a, b, **params)
+    
+    if method not in ("analytical", "quad") and params.get("seed") is None:
+        return compute()
+    
+    try:
+        key_params = _key_params(functions[method], params) if method in functions else params
+        key = make_key(method, integrand_key(func), float(a), float(b), key_params)
+    except UncacheableError:
+        # Функція залежить від даних без стабільної ідентичності - без кешу
+        return compute()
+    return _result_cache.get_or_compute(key, compute)
+
+def downsample_minmax(x, y, max_points: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Зменшує ряд до ~max_points точок, зберігаючи мінімум і максимум кожного
+    інтервалу (векторизована min/max-децимація).
+    
+    Args:
+        x: Значення по осі x
+        y: Значення по осі y
+        max_points: Бюджет точок (напр. ширина графіка в пікселях)
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Зменшені x та y (перша та остання точки збережені)
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points:
+        return x, y
+    
+    buckets = max(1, (max_points - 2) // 2)
+    bucket_size = -(-n // buckets)
+    padded = np.pad(y, (0, buckets * bucket_size - n), mode="edge").reshape(buckets, bucket_size)
+    offsets = np.arange(buckets) * bucket_size
+    indices = np.concatenate(([0, n - 1],
+                              offsets + padded.argmin(axis=1),
+                              offsets + padded.argmax(axis=1)))
+    indices = np.unique(np.minimum(indices, n - 1))
+    return x[indices], y[indices]
+
+def downsample_lttb(x, y, max_points: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Зменшує ряд до max_points точок алгоритмом Largest-Triangle-Three-Buckets,
+    який зберігає візуальну форму кривої.
+    
+    Args:
+        x: Значення по осі x
+        y: Значення по осі y
+        max_points: Бюджет точок (щонайменше 3)
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Зменшені x та y
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points or max_points < 3:
+        return x, y
+    
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Середня точка наступного інтервалу (для останнього - остання точка ряду)
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        next_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+        
+        # Обираємо точку, що утворює найбільший трикутник з попередньою та наступною
+        areas = np.abs((x[previous] - next_x) * (y[start:stop] - y[previous])
+                       - (x[previous] - x[start:stop]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    
+    return x[selected], y[selected]
+
+def _new_figure(output: Optional[str], **subplot_kw):
+    """
+    Створює фігуру: через pyplot для інтерактивного показу або напряму
+    (без графічного бекенда) для збереження у файл.
+    """
+    if output is not None:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=subplot_kw.pop("figsize", None))
+        return fig, fig.subplots(**subplot_kw)
+    import matplotlib.pyplot as plt
+    return plt.subplots(**subplot_kw)
+
+def _show_or_save(fig, output: Optional[str]):
+    """
+    Показує фігуру або зберігає її у файл (PNG, SVG тощо за розширенням output).
+    """
+    fig.tight_layout()
+    if output is not None:
+        fig.savefig(output)
+    else:
+        import matplotlib.pyplot as plt
+        plt.show()
+
+def plot_function_and_integration(a: float, b: float, output: Optional[str] = None):
     """
     Створює графік функції та області інтегрування.
+    
+    Args:
+        a: Нижня межа інтегрування
+        b: Верхня межа інтегрування
+        output: Шлях до файлу для збереження (None - показати у вікні)
     """
     # Створення діапазону значень для x
     x = np.linspace(-0.5, 2.5, 400)
     y = f(x)
     
     # Створення графіка
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _new_figure(output, figsize=(10, 6))
     
     # Малювання функції
     ax.plot(x, y, 'r', linewidth=2, label='f(x) = x²')
@@ -139,16 +1065,29 @@ def plot_function_and_integration(a: float, b: float):
     ax.legend()
     ax.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.show()
+    _show_or_save(fig, output)
 
-def plot_convergence(history: List[float], true_value: float, n_points: int):
+def plot_convergence(history: List[float], true_value: float, n_points: int,
+                     iterations=None, max_points: int = 2000,
+                     output: Optional[str] = None):
     """
     Створює графік збіжності методу Монте-Карло.
+    
+    Args:
+        history: Історія наближень
+        true_value: Точне значення інтеграла
+        n_points: Загальна кількість точок
+        iterations: Номери точок для кожного елемента history
+            (за замовчуванням 1..len(history), тобто режим "full")
+        max_points: Максимальна кількість точок на кожній кривій (довші ряди
+            зменшуються min/max-децимацією)
+        output: Шлях до файлу для збереження (None - показати у вікні)
     """
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 5))
+    fig, (ax1, ax2) = _new_figure(output, nrows=1, ncols=2, figsize=(15, 5))
     
-    iterations = range(1, len(history) + 1)
+    if iterations is None:
+        iterations = np.arange(1, len(history) + 1)
+    iterations, history = downsample_minmax(iterations, history, max_points)
     
     # Графік збіжності
     ax1.plot(iterations, history, 'b-', alpha=0.7, label='Наближення Монте-Карло')
@@ -160,7 +1099,7 @@ def plot_convergence(history: List[float], true_value: float, n_points: int):
     ax1.grid(True, alpha=0.3)
     
     # Графік похибки
-    errors = [abs(estimate - true_value) for estimate in history]
+    errors = np.abs(np.asarray(history) - true_value)
     ax2.plot(iterations, errors, 'g-', alpha=0.7)
     ax2.set_xlabel('Кількість точок')
     ax2.set_ylabel('Абсолютна похибка')
@@ -168,39 +1107,108 @@ def plot_convergence(history: List[float], true_value: float, n_points: int):
     ax2.set_yscale('log')
     ax2.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.show()
+    _show_or_save(fig, output)
 
-if __name__ == "__main__":
-    print("📚 Завантажено функції для методу Монте-Карло")
-    print("Запустіть task2_part2.py для виконання обчислень")
-def compare_methods(a: float, b: float, n_points: List[int]):
+def compare_methods(a: float, b: float, n_points: List[int], sampler: str = "random",
+                    replicates: int = 5, seed: Optional[int] = None):
     """
     Порівнює точність методу Монте-Карло для різної кількості точок.
+    
+    Бюджет дорівнює max(n_points) точок, як і в одиночному запуску: його
+    поділено між replicates незалежними репліками по max(n_points) / replicates
+    точок. Оцінка для n - середнє реплік, кожна з яких бере перші n / replicates
+    точок свого потоку (усього n точок, префіксні суми без повторних запусків),
+    а стандартна похибка - розкид цих оцінок між репліками, поділений на
+    sqrt(replicates). Для квазівипадкових генераторів репліки - незалежні
+    скремблювання, тож похибка оцінюється коректно і для них.
+    
+    Args:
+        a: Нижня межа інтегрування
+        b: Верхня межа інтегрування
+        n_points: Кількості точок для порівняння
+        sampler: Генератор точок: "random", "sobol" або "halton"
+        replicates: Кількість незалежних реплік, між якими ділиться бюджет
+        seed: Зерно генератора (None - випадкове)
     """
     print(f"\n📊 ПОРІВНЯННЯ ТОЧНОСТІ ДЛЯ РІЗНОЇ КІЛЬКОСТІ ТОЧОК")
-    print("=" * 65)
+    print("=" * 80)
     
-    true_value = analytical_integral(a, b)
-    scipy_result, scipy_error = spi.quad(f, a, b)
+    true_value = cached_integral("analytical", f, a, b)
+    scipy_result, scipy_error = cached_integral("quad", f, a, b)
     
     print(f"Аналітичне значення: {true_value:.8f}")
     print(f"SciPy quad результат: {scipy_result:.8f} ± {scipy_error:.2e}")
+    print(f"Реплік: {replicates}")
     print()
     
-    print(f"{'Точки':<8} {'Монте-Карло':<12} {'Похибка':<12} {'Відн. похибка (%)':<18}")
-    print("-" * 65)
+    # Бюджет max(n) ділиться між репліками, контрольні точки - n / replicates
+    n_points = np.asarray(n_points, dtype=np.int64)
+    checkpoints = np.unique(np.maximum(n_points // replicates, 1))
+    per_replicate = int(checkpoints[-1])
+    # Ще одне зерно - для таблиці зменшення дисперсії (перші replicates ті самі)
+    *replicate_seeds, variance_seed = np.random.SeedSequence(seed).generate_state(replicates + 1)
+    # Із заданим seed репліки відтворювані, тому повторні запуски беруться з кешу
+    run = cached_integral if seed is not None else (
+        lambda method, *args, **params: monte_carlo_integration(*args, **params))
+    estimates = np.array([
+        run("monte_carlo", f, a, b, n=per_replicate, history="at", checkpoints=checkpoints,
+            seed=int(replicate_seed), sampler=sampler)[1]
+        for replicate_seed in replicate_seeds
+    ])
+    pooled = estimates.mean(axis=0)
+    std_errors = estimates.std(axis=0, ddof=1) / np.sqrt(replicates) if replicates > 1 \
+        else np.full(len(checkpoints), np.nan)
+    
+    print(f"{'Точки':<8} {'Монте-Карло':<12} {'Похибка':<12} {'Відн. похибка (%)':<18} {'Ст. похибка':<12}")
+    print("-" * 80)
     
-    for n in n_points:
-        mc_result, _ = monte_carlo_integration(f, a, b, n)
+    for n in n_points.tolist():
+        column = int(np.searchsorted(checkpoints, max(n // replicates, 1)))
+        mc_result = pooled[column]
         error = abs(mc_result - true_value)
         relative_error = (error / true_value) * 100
         
-        print(f"{n:<8} {mc_result:<12.6f} {error:<12.6f} {relative_error:<18.4f}")
+        print(f"{n:<8} {mc_result:<12.6f} {error:<12.6f} {relative_error:<18.4f} "
+              f"{std_errors[column]:<12.6f}")
+    
+    compare_variance_reduction(a, b, 10_000, seed=int(variance_seed))
+
+def compare_variance_reduction(a: float, b: float, n: int, seed: Optional[int] = None):
+    """
+    Порівнює методи зменшення дисперсії з звичайним методом Монте-Карло.
+    
+    Економія точок - у скільки разів менше точок потрібно методу для тієї ж
+    похибки, що й у звичайного методу (відношення дисперсій).
+    """
+    print(f"\n📉 ЗМЕНШЕННЯ ДИСПЕРСІЇ ({n:,} точок)")
+    print("=" * 65)
+    
+    true_value = analytical_integral(a, b)
+    density = linear_density(a, b) if 0 <= a < b else None
+    
+    print(f"{'Метод':<12} {'Оцінка':<12} {'Похибка':<12} {'Дисперсія':<12} {'Економія точок':<14}")
+    print("-" * 65)
+    
+    _, crude_variance = monte_carlo_variance_reduced(f, a, b, n, method="crude", seed=seed)
+    for method in VARIANCE_REDUCTION_METHODS:
+        if method == "importance" and density is None:
+            continue
+        estimate, variance = monte_carlo_variance_reduced(f, a, b, n, method=method,
+                                                          seed=seed, density=density)
+        # Дисперсія на рівні похибки округлення вважається нульовою
+        saving = crude_variance / variance if variance > crude_variance * 1e-12 else float("inf")
+        print(f"{method:<12} {estimate:<12.6f} {abs(estimate - true_value):<12.6f} "
+              f"{variance:<12.2e} {saving:<14.1f}")
 
-def demonstrate_geometric_method(a: float, b: float, n: int):
+def demonstrate_geometric_method(a: float, b: float, n: int, output: Optional[str] = None):
     """
     Демонструє геометричний метод Монте-Карло з візуалізацією.
+    
+    Args:
+        a: Нижня межа інтегрування
+        b: Верхня межа інтегрування
+        n: Кількість випадкових точок
+        output: Шлях до файлу для збереження (None - показати у вікні)
     """
     print(f"\n🎯 ГЕОМЕТРИЧНИЙ МЕТОД МОНТЕ-КАРЛО")
     print("=" * 40)
@@ -214,7 +1222,7 @@ def demonstrate_geometric_method(a: float, b: float, n: int):
     print(f"Оцінка інтеграла: {geometric_result:.6f}")
     
     # Візуалізація геометричного методу
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _new_figure(output, figsize=(10, 6))
     
     # Малюємо функцію
     x_plot = np.linspace(a, b, 100)
@@ -230,7 +1238,7 @@ def demonstrate_geometric_method(a: float, b: float, n: int):
     y_points = np.random.uniform(0, y_max, vis_n)
     
     # Розфарбовуємо точки
-    colors = ['green' if y <= f(x) else 'red' for x, y in zip(x_points, y_points)]
+    colors = np.where(y_points <= f(x_points), 'green', 'red')
     ax.scatter(x_points, y_points, c=colors, alpha=0.6, s=1)
     
     ax.set_xlim([a, b])
@@ -241,8 +1249,7 @@ def demonstrate_geometric_method(a: float, b: float, n: int):
     ax.legend()
     ax.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.show()
+    _show_or_save(fig, output)
 
 def main():
     """
@@ -266,19 +1273,19 @@ def main():
     plot_function_and_integration(a, b)
     
     # Обчислення точного значення
-    true_value = analytical_integral(a, b)
+    true_value = cached_integral("analytical", f, a, b)
     print(f"\n🎯 Аналітичне обчислення:")
     print(f"∫[{a}→{b}] x² dx = [x³/3][{a}→{b}] = {b}³/3 - {a}³/3 = {true_value:.8f}")
     
     # Перевірка за допомогою SciPy
-    scipy_result, scipy_error = spi.quad(f, a, b)
+    scipy_result, scipy_error = cached_integral("quad", f, a, b)
     print(f"\n🔬 Перевірка з SciPy quad:")
     print(f"Результат: {scipy_result:.8f}")
     print(f"Оцінка похибки: {scipy_error:.2e}")
     
     # Обчислення методом Монте-Карло
     print(f"\n🎲 Метод Монте-Карло:")
-    mc_result, history = monte_carlo_integration(f, a, b, n)
+    mc_result, history = monte_carlo_integration(f, a, b, n, history="log", checkpoints=2000)
     mc_error = abs(mc_result - true_value)
     mc_relative_error = (mc_error / true_value) * 100
     
@@ -288,7 +1295,15 @@ def main():
     
     # Графік збіжності
     print(f"\n📊 Аналіз збіжності...")
-    plot_convergence(history, true_value, n)
+    plot_convergence(history, true_value, n,
+                     iterations=history_indices(n, "log", 2000))
+    
+    # Адаптивний вибір кількості точок під задану точність
+    adaptive_result, adaptive_se, adaptive_n, _ = adaptive_monte_carlo_integration(
+        f, a, b, rel_tol=0.01)
+    print(f"\n🎚️ Адаптивний метод Монте-Карло (точність 1%, рівень довіри 95%):")
+    print(f"Результат: {adaptive_result:.8f} ± {adaptive_se:.2e}")
+    print(f"Використано точок: {adaptive_n:,}")
     
     # Порівняння для різної кількості точок
     n_points = [100, 1000, 10000, 100000, 1000000]
@@ -341,5 +1356,61 @@ def main():
         'relative_error': mc_relative_error
     }
 
+def compute_results(a: float = 0, b: float = 2, n: int = 100000,
+                    seed: Optional[int] = None) -> dict:
+    """
+    Обчислює інтеграл усіма методами без друку та графіків.
+    
+    Returns:
+        dict: Результати у форматі, придатному для JSON
+    """
+    true_value = cached_integral("analytical", f, a, b)
+    scipy_result, scipy_error = cached_integral("quad", f, a, b)
+    mc_result, _ = cached_integral("monte_carlo", f, a, b, n=n, history="none", seed=seed)
+    mc_error = abs(mc_result - true_value)
+    
+    return {
+        'a': a,
+        'b': b,
+        'n': n,
+        'seed': seed,
+        'analytical': true_value,
+        'scipy': scipy_result,
+        'scipy_error': scipy_error,
+        'monte_carlo': mc_result,
+        'error': mc_error,
+        'relative_error': (mc_error / true_value) * 100
+    }
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входу командного рядка. З --json друкує результати у форматі JSON
+    без графіків; без нього запускає інтерактивну демонстрацію main().
+    """
+    import argparse
+    import json
+    import sys
+    
+    parser = argparse.ArgumentParser(description="Обчислення інтеграла f(x) = x² методом Монте-Карло")
+    parser.add_argument("--json", action="store_true", help="надрукувати результати у форматі JSON")
+    parser.add_argument("-a", type=float, default=0, help="нижня межа інтегрування")
+    parser.add_argument("-b", type=float, default=2, help="верхня межа інтегрування")
+    parser.add_argument("-n", type=int, default=100000, help="кількість точок Монте-Карло")
+    parser.add_argument("--seed", type=int, default=None, help="зерно генератора")
+    parser.add_argument("--metrics", metavar="FILE", help="записати метрики виконання у файл JSON")
+    args = parser.parse_args(argv)
+    
+    if args.metrics:
+        metrics.enable()
+    
+    if not args.json:
+        main()
+    else:
+        print(json.dumps(compute_results(args.a, args.b, args.n, args.seed), ensure_ascii=False))
+    
+    if args.metrics:
+        metrics.export(args.metrics, {"argv": sys.argv[1:] if argv is None else argv})
+    return 0
+
 if __name__ == "__main__":
-    result = main()
+    raise SystemExit(cli())